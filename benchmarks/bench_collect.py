@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+순차 수집 vs 비동기 수집 처리량 비교 (로컬 스텁 서버 사용)
+
+사용법:
+    python benchmarks/bench_collect.py --keywords 35 --rps 10
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import stub_naver_server
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--keywords", type=int, default=35, help="측정에 쓸 키워드 수")
+    ap.add_argument("--rps", type=float, default=10.0, help="비동기 모드 초당 요청 수")
+    ap.add_argument("--latency", type=float, default=0.05, help="스텁 응답 지연(초)")
+    ap.add_argument("--pause", type=float, default=0.1,
+                    help="순차 모드 PAUSE_SEC (기본 1.0은 너무 오래 걸려 축소)")
+    args = ap.parse_args()
+
+    server, url = stub_naver_server.start_in_background(port=0, latency=args.latency)
+    os.environ["NAVER_LOCAL_API_URL"] = url
+    os.environ.setdefault("NAVER_CLIENT_ID", "stub")
+    os.environ.setdefault("NAVER_CLIENT_SECRET", "stub")
+    import main as rank_main
+
+    rows = rank_main.load_keywords(os.path.join(ROOT, "keywords.csv"))
+    rows = (rows * (args.keywords // len(rows) + 1))[:args.keywords]
+
+    rank_main.PAUSE_SEC = args.pause
+    t0 = time.perf_counter()
+    sync_ranks = rank_main.collect_sync(rows, rank_main.TokenBucket(1 / args.pause))
+    t_sync = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    limiter = rank_main.TokenBucket(args.rps, capacity=max(1, int(args.rps)))
+    async_ranks = asyncio.run(rank_main.collect_async(rows, limiter))
+    t_async = time.perf_counter() - t0
+    server.shutdown()
+
+    assert [r for r, _ in sync_ranks] == [r for r, _ in async_ranks], "순위 결과 불일치"
+    print()
+    print(f"키워드 {len(rows)}개")
+    print(f"순차 (PAUSE_SEC={args.pause}): {t_sync:.2f}초")
+    print(f"비동기 ({args.rps} req/s):     {t_async:.2f}초")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+대시보드 HTML 렌더링: 문자열 += 누적(개선 전) vs 템플릿 + join / 파일로 흘려 쓰기
+
+합성 순위 카드(기본 1만 개)로 렌더링 시간을 재고, 두 결과가 같은지 확인한다.
+
+사용법:
+    python benchmarks/bench_dashboard.py --cards 10000
+"""
+
+import argparse
+import itertools
+import os
+import random
+import sys
+import tempfile
+import time
+from html import escape
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import create_dashboard
+from results_store import RankRecord
+
+def render_before(ranks_data):
+    """개선 전 create_web_dashboard의 카드 누적 방식 (앞뒤 정적 부분은 그대로 이어 붙임)"""
+    ranked_branches = [r for r in ranks_data if r.rank is not None]
+    html_content = "".join(itertools.islice(create_dashboard.iter_dashboard(ranks_data), 2))   # 헤더 + 통계
+
+    sorted_ranked = sorted(ranked_branches, key=lambda x: x.rank)
+    for branch_data in sorted_ranked:
+        rank = branch_data.rank
+        if rank == 1:
+            rank_class = "rank-1"
+            badge_text = f"🥇 {rank}위"
+        elif rank <= 3:
+            rank_class = "rank-2-3"
+            badge_text = f"🥈 {rank}위"
+        elif rank <= 5:
+            rank_class = "rank-4-5"
+            badge_text = f"🥉 {rank}위"
+        else:
+            rank_class = "rank-other"
+            badge_text = f"📍 {rank}위"
+
+        html_content += f"""
+                <div class="rank-card" data-branch="{escape(branch_data.branch)}" data-keyword="{escape(branch_data.keyword)}">
+                    <div class="rank-badge {rank_class}">{badge_text}</div>
+                    <div class="branch-name">{branch_data.branch}</div>
+                    <div class="keyword">{branch_data.keyword}</div>
+                </div>
+"""
+
+    no_rank_branches = [r for r in ranks_data if r.rank is None]
+    for branch_data in no_rank_branches:
+        html_content += f"""
+                <div class="rank-card no-rank" data-branch="{escape(branch_data.branch)}" data-keyword="{escape(branch_data.keyword)}">
+                    <div class="rank-badge rank-other">❌ 순위없음</div>
+                    <div class="branch-name">{branch_data.branch}</div>
+                    <div class="keyword">{branch_data.keyword}</div>
+                </div>
+"""
+
+    html_content += create_dashboard._PAGE_TAIL
+    return html_content
+
+def make_ranks(cards: int, seed=0):
+    rng = random.Random(seed)
+    return [RankRecord(
+        timestamp="", branch=f"지점{i % 500}", keyword=f"지점{i % 500} 키워드{i // 500} 한의원",
+        rank=rng.randint(1, 50) if rng.random() < 0.6 else None,
+        title="", link="", address="", telephone="",
+    ) for i in range(cards)]
+
+def best_of(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--cards", type=int, default=10_000)
+    ap.add_argument("--repeat", type=int, default=5)
+    args = ap.parse_args()
+
+    ranks_data = make_ranks(args.cards)
+    # 통계 헤더의 시각이 분 단위라 같은 분 안에서 비교
+    before = render_before(ranks_data)
+    after = create_dashboard.render_dashboard(ranks_data)
+    assert before == after, "렌더링 결과가 다릅니다"
+
+    with tempfile.TemporaryDirectory() as tmp:
+        out_path = os.path.join(tmp, "dashboard.html")
+        t_before = best_of(lambda: render_before(ranks_data), args.repeat)
+        t_join = best_of(lambda: create_dashboard.render_dashboard(ranks_data), args.repeat)
+        t_write = best_of(lambda: create_dashboard.write_dashboard(ranks_data, out_path), args.repeat)
+        size = os.path.getsize(out_path)
+
+    print(f"카드 {args.cards:,}개, HTML {size / 1024:.0f}KB")
+    print(f"문자열 += 누적:        {t_before * 1000:.1f}ms")
+    print(f"템플릿 + join:         {t_join * 1000:.1f}ms")
+    print(f"템플릿 → 파일(원자적): {t_write * 1000:.1f}ms")
+
+if __name__ == "__main__":
+    main()
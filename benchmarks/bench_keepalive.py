@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+요청마다 새 연결(requests.get) vs keep-alive 세션(NaverLocalClient) 지연 비교
+
+기본은 로컬 스텁 서버(HTTP)를 쓰고, --url로 실제 API를 지정하면 TLS 핸드셰이크까지 측정한다.
+
+사용법:
+    python benchmarks/bench_keepalive.py --requests 200
+    python benchmarks/bench_keepalive.py --url https://openapi.naver.com/v1/search/local.json --requests 20
+"""
+
+import argparse
+import os
+import sys
+import time
+from urllib.parse import quote
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import requests
+import stub_naver_server
+from naver_client import NaverLocalClient, CID, CSECRET
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--requests", type=int, default=200)
+    ap.add_argument("--url", help="측정할 API 주소 (기본: 로컬 스텁 서버)")
+    args = ap.parse_args()
+
+    server = None
+    if args.url:
+        url, cid, csecret = args.url, CID, CSECRET
+    else:
+        server, url = stub_naver_server.start_in_background(port=0)
+        cid, csecret = "stub", "stub"
+    headers = {"X-Naver-Client-Id": cid or "", "X-Naver-Client-Secret": csecret or ""}
+    queries = ["강남 한의원", "잠실 한의원", "분당 한의원", "부산 서면 한의원"]
+
+    t0 = time.perf_counter()
+    for i in range(args.requests):
+        q = queries[i % len(queries)]
+        r = requests.get(f"{url}?query={quote(q)}&start=1&display=5",
+                         headers=headers, timeout=10, verify=False)
+        r.raise_for_status()
+    t_plain = time.perf_counter() - t0
+
+    client = NaverLocalClient(cid, csecret, api_url=url)
+    t0 = time.perf_counter()
+    for i in range(args.requests):
+        client.search(queries[i % len(queries)], 1, 5)
+    t_session = time.perf_counter() - t0
+    client.close()
+    if server:
+        server.shutdown()
+
+    n = args.requests
+    print(f"요청 {n}회 → {url}")
+    print(f"requests.get (매번 새 연결): {t_plain / n * 1000:.2f}ms/요청")
+    print(f"NaverLocalClient (keep-alive): {t_session / n * 1000:.2f}ms/요청")
+    print(f"요청당 연결 비용: {(t_plain - t_session) / n * 1000:.2f}ms")
+
+if __name__ == "__main__":
+    main()
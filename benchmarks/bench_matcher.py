@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+지점별 find_first_rank_local 반복 vs PatternMatcher 한 번 훑기 비교
+
+같은 검색 결과(50개)를 지점 N개의 patterns로 매칭하는 비용을 잰다.
+
+사용법:
+    python benchmarks/bench_matcher.py --branches 500
+"""
+
+import argparse
+import os
+import re
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from rank_matcher import PatternMatcher, item_fields, item_haystack
+
+def find_first_rank_local_before(items, patterns):
+    """개선 전 main.find_first_rank_local (매 호출 정규화 + 컴파일 안 된 re.sub)"""
+    patterns = [p.strip().lower() for p in patterns if p.strip()]
+    for idx, it in enumerate(items, start=1):
+        title = re.sub(r"<.*?>", "", it.get("title", "") or "")
+        link = it.get("link", "")
+        addr = " ".join([it.get("roadAddress", ""), it.get("address", "")]).strip()
+        phone = it.get("telephone", "")
+        haystack = " ".join([title, link, addr, phone]).lower()
+        if any(p in haystack for p in patterns):
+            return idx, {"title": title, "link": link, "address": addr, "telephone": phone}
+    return None, None
+
+def make_items(n=50):
+    return [{
+        "title": f"<b>지점{i}</b> 한의원",
+        "link": f"https://example.com/place/{i}",
+        "roadAddress": f"서울 어딘가로 {i}",
+        "address": f"서울 어딘가동 {i}",
+        "telephone": f"02-000-{i:04d}",
+    } for i in range(1, n + 1)]
+
+def make_patterns(branches):
+    # 대부분은 결과에 없고, 일부만 뒤쪽 순위에 걸리게 (최악에 가까운 경우)
+    return [[f"함소아한의원 지점{b}", f"지점{b} 함소아", f"hamsoa.com/reservation/{b}", f"지점{b + 1000}"]
+            for b in range(branches)]
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--branches", type=int, default=500)
+    ap.add_argument("--repeat", type=int, default=5)
+    args = ap.parse_args()
+
+    items = make_items()
+    pattern_lists = make_patterns(args.branches)
+
+    t0 = time.perf_counter()
+    for _ in range(args.repeat):
+        before = [find_first_rank_local_before(items, pats)[0] for pats in pattern_lists]
+    t_before = (time.perf_counter() - t0) / args.repeat
+
+    t0 = time.perf_counter()
+    matcher = PatternMatcher(pattern_lists)
+    t_build = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    for _ in range(args.repeat):
+        after = [None] * len(pattern_lists)
+        for idx, it in enumerate(items, start=1):
+            for owner in matcher.match(item_haystack(item_fields(it))):
+                if after[owner] is None:
+                    after[owner] = idx
+    t_after = (time.perf_counter() - t0) / args.repeat
+
+    assert before == after, "매칭 결과 불일치"
+    print(f"지점 {args.branches}개 × 결과 {len(items)}개")
+    print(f"지점별 find_first_rank_local: {t_before * 1000:.1f}ms")
+    print(f"PatternMatcher 한 번 훑기:    {t_after * 1000:.1f}ms (오토마톤 생성 {t_build * 1000:.1f}ms, 시트당 1회)")
+    print(f"속도 향상: {t_before / t_after:.1f}배")
+
+if __name__ == "__main__":
+    main()
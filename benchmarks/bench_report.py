@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+make_report: 순차 pandas ExcelWriter(개선 전) vs 작업 프로세스 + write_only 통합 문서
+
+임시 폴더에 합성 이력(기본 100만 행, 1년치)으로 results.sqlite3를 만들고,
+두 방식을 각각 새 프로세스에서 돌려 걸린 시간과 최대 메모리(RSS, 작업 프로세스 포함)를 잰다.
+
+사용법:
+    python benchmarks/bench_report.py --rows 1000000
+    python benchmarks/bench_report.py --rows 1000000 --raw month
+"""
+
+import argparse
+import json
+import os
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+RUN_ROWS = 1000   # 회차 하나의 행 수
+
+def make_store(path: str, rows: int, branches: int, keywords: int, seed=0):
+    """rows행을 RUN_ROWS행짜리 회차들로 1년에 고르게 나눠 넣는다"""
+    from results_store import ResultsStore
+    rng = random.Random(seed)
+    runs = max(1, rows // RUN_ROWS)
+    start = time.mktime((2025, 1, 1, 9, 0, 0, 0, 0, -1))
+    step = 365 * 86400 / runs
+    with ResultsStore(path) as store:
+        for n in range(runs):
+            ts = time.strftime("%Y%m%d_%H%M", time.localtime(start + n * step))
+            count = RUN_ROWS if n < runs - 1 else rows - RUN_ROWS * (runs - 1)
+
+            def run_rows():
+                for _ in range(count):
+                    rank = rng.randint(1, 50) if rng.random() < 0.6 else None
+                    b = rng.randrange(branches)
+                    yield {
+                        "timestamp": ts, "keyword": f"키워드{rng.randrange(keywords)} 한의원",
+                        "branch": f"지점{b}", "rank_local": rank if rank is not None else "",
+                        "match_title": f"함소아한의원 지점{b}" if rank else "",
+                        "match_link": f"https://example.com/{b}" if rank else "",
+                        "match_address": f"지점{b}로 {b}" if rank else "", "match_telephone": "",
+                        "check_depth": 50,
+                    }
+            store.append_run(run_rows(), f"results_{ts}.csv")
+
+def report_before():
+    """개선 전 make_report.run (전체 이력을 DataFrame으로 읽고 pandas ExcelWriter로 순차 작성)"""
+    import pandas as pd
+    import make_report
+    df = make_report.load_all_results()
+    summary = make_report.summarize_by_branch(df)
+    tops = make_report.top_keywords_per_branch(df, topn=5)
+    attention = make_report.keywords_needing_attention(df, limit=100)
+    with pd.ExcelWriter(make_report.OUT_XLSX, engine="openpyxl") as xw:
+        summary.to_excel(xw, index=False, sheet_name="Summary_ByBranch")
+        tops.to_excel(xw, index=False, sheet_name="TopKeywords")
+        attention.to_excel(xw, index=False, sheet_name="Needs_Attention")
+        make_report.latest_changes().to_excel(xw, index=False, sheet_name="Changes")
+        df.to_excel(xw, index=False, sheet_name="Raw")
+
+def worker(mode: str, raw: str):
+    import make_report
+    t0 = time.perf_counter()
+    if mode == "before":
+        report_before()
+    else:
+        make_report.run(rebuild=True, raw_mode=raw)
+    wall = time.perf_counter() - t0
+    rss = max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+              resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+    print(json.dumps({"wall": wall, "rss_mb": rss / 1024}))
+
+def measure(cwd: str, mode: str, raw: str):
+    proc = subprocess.run([sys.executable, os.path.abspath(__file__), "--worker", mode, "--raw", raw],
+                          cwd=cwd, capture_output=True, text=True, check=True)
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rows", type=int, default=1_000_000)
+    ap.add_argument("--branches", type=int, default=300)
+    ap.add_argument("--keywords", type=int, default=600)
+    ap.add_argument("--raw", default="auto", help="개선 후 방식의 make_report --raw")
+    ap.add_argument("--skip-before", action="store_true", help="개선 전 방식은 재지 않음 (오래 걸림)")
+    ap.add_argument("--worker", choices=("before", "after"), help=argparse.SUPPRESS)
+    args = ap.parse_args()
+
+    if args.worker:
+        worker(args.worker, args.raw)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        t0 = time.perf_counter()
+        make_store(os.path.join(tmp, "results.sqlite3"), args.rows, args.branches, args.keywords)
+        print(f"합성 이력 {args.rows:,}행 ({time.perf_counter() - t0:.1f}초)")
+        modes = ("after",) if args.skip_before else ("before", "after")
+        for mode in modes:
+            r = measure(tmp, mode, args.raw)
+            label = "순차 ExcelWriter" if mode == "before" else f"병렬 + write_only (--raw {args.raw})"
+            size = os.path.getsize(os.path.join(tmp, "report_local_rank.xlsx")) / 1e6
+            print(f"{label}: {r['wall']:.1f}초, 최대 메모리 {r['rss_mb']:.0f}MB, 파일 {size:.1f}MB")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+대시보드 서버 부하 테스트: 동시 /api/data 폴러 N개의 p50/p99 지연과 초당 요청 수
+
+- pooled: web_common.PooledHTTPServer (스레드 풀 + keep-alive)
+- single: 개선 전 socketserver.TCPServer (한 번에 한 요청, HTTP/1.0)
+요청만 열어두고 아무것도 보내지 않는 느린 클라이언트(--stalled)도 함께 띄운다.
+
+사용법:
+    python benchmarks/bench_server_load.py --clients 200 --requests 20
+"""
+
+import argparse
+import csv
+import http.client
+import os
+import socket
+import socketserver
+import sys
+import tempfile
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import simple_server
+from web_common import PooledHTTPServer
+
+class QuietHandler(simple_server.CustomHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+class QuietHTTP10Handler(QuietHandler):
+    protocol_version = "HTTP/1.0"
+
+class QuietTCPServer(socketserver.TCPServer):
+    def handle_error(self, request, client_address):
+        pass
+
+def write_results(path, rows=500):
+    with open(path, "w", newline="", encoding="utf-8-sig") as f:
+        w = csv.writer(f)
+        w.writerow(["timestamp", "keyword", "branch", "rank_local", "match_title",
+                    "match_link", "match_address", "match_telephone"])
+        for i in range(rows):
+            w.writerow(["20250101_0900", f"지역{i} 한의원", f"지점{i}", i % 50 or "",
+                        f"함소아한의원 지점{i}", "https://example.com", "서울", ""])
+
+def run_load(port, clients, requests, stalled):
+    latencies = []
+    lock = threading.Lock()
+    barrier = threading.Barrier(clients + 1)
+    errors = [0]
+
+    def poller():
+        conn = None
+        mine = []
+        barrier.wait()
+        for _ in range(requests):
+            t0 = time.perf_counter()
+            try:
+                if conn is None:
+                    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+                conn.request("GET", "/api/data")
+                resp = conn.getresponse()
+                resp.read()
+                if resp.will_close:
+                    conn.close()
+                    conn = None
+            except Exception:
+                errors[0] += 1
+                if conn:
+                    conn.close()
+                conn = None
+                continue
+            mine.append(time.perf_counter() - t0)
+        if conn:
+            conn.close()
+        with lock:
+            latencies.extend(mine)
+
+    stalls = []
+    for _ in range(stalled):
+        s = socket.create_connection(("127.0.0.1", port))
+        s.sendall(b"GET /api/data HTTP/1.1\r\n")   # 요청을 끝까지 보내지 않는 느린 클라이언트
+        stalls.append(s)
+
+    threads = [threading.Thread(target=poller) for _ in range(clients)]
+    for t in threads:
+        t.start()
+    barrier.wait()
+    t0 = time.perf_counter()
+    for t in threads:
+        t.join()
+    wall = time.perf_counter() - t0
+    for s in stalls:
+        s.close()
+
+    latencies.sort()
+    pct = lambda p: latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1000 if latencies else float("nan")
+    return len(latencies), errors[0], wall, pct(0.5), pct(0.99)
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--clients", type=int, default=200)
+    ap.add_argument("--requests", type=int, default=20, help="폴러당 요청 수")
+    ap.add_argument("--workers", type=int, default=32)
+    ap.add_argument("--stalled", type=int, default=1, help="요청을 보내다 멈춘 클라이언트 수")
+    ap.add_argument("--skip-single", action="store_true", help="개선 전 서버 측정 생략")
+    args = ap.parse_args()
+
+    workdir = tempfile.mkdtemp()
+    write_results(os.path.join(workdir, "results_20250101_0900.csv"))
+    os.chdir(workdir)
+
+    modes = [("pooled", lambda: PooledHTTPServer(("127.0.0.1", 0), QuietHandler, args.workers))]
+    if not args.skip_single:
+        # 멈춘 클라이언트가 있으면 단일 스레드 서버는 타임아웃까지 전부 막히므로 핸들러 타임아웃을 짧게
+        QuietHTTP10Handler.timeout = 3
+        modes.append(("single", lambda: QuietTCPServer(("127.0.0.1", 0), QuietHTTP10Handler)))
+
+    print(f"폴러 {args.clients}개 × {args.requests}회, 멈춘 클라이언트 {args.stalled}개")
+    for name, make in modes:
+        server = make()
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        port = server.server_address[1]
+        n, errors, wall, p50, p99 = run_load(port, args.clients, args.requests, args.stalled)
+        server.shutdown()
+        server.server_close()
+        print(f"{name:>6}: {n / wall:8.0f} req/s  p50 {p50:7.1f}ms  p99 {p99:7.1f}ms  (오류 {errors})")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+naver_local_rank 명령별 시작 비용 (python -X importtime)
+
+명령마다 새 인터프리터에서 그 명령의 모듈만 불러오고(load_command, 실행은 안 함)
+import 시간 합계와 가장 무거운 모듈을 보여준다.
+비교용 "eager"는 모든 스크립트와 openpyxl을 맨 위에서 한꺼번에 import하는 경우.
+
+사용법:
+    python benchmarks/bench_startup.py --repeat 5
+"""
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from naver_local_rank import COMMANDS
+
+_LINE_RE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+EAGER = ("import main, show_ranks, daily_summary, make_report, create_dashboard, "
+         "smart_web_server, openpyxl")
+
+def measure(code: str):
+    """(import 합계 ms, 실행 시간 ms, 가장 무거운 최상위 import 3개)"""
+    t0 = time.perf_counter()
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                          cwd=ROOT, capture_output=True, text=True, check=True)
+    wall = (time.perf_counter() - t0) * 1000
+    total_us = 0
+    top = []
+    for line in proc.stderr.splitlines():
+        m = _LINE_RE.match(line)
+        if not m:
+            continue
+        self_us, cumulative_us, indent, name = int(m.group(1)), int(m.group(2)), m.group(3), m.group(4)
+        total_us += self_us
+        if len(indent) == 1:    # 최상위 import
+            top.append((cumulative_us, name))
+    top.sort(reverse=True)
+    return total_us / 1000, wall, [f"{name} {us / 1000:.0f}ms" for us, name in top[:3]]
+
+def best_of(code: str, repeat: int):
+    runs = [measure(code) for _ in range(repeat)]
+    return min(runs, key=lambda r: r[0])
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args()
+
+    cases = [(name, f"import naver_local_rank as n; n.load_command({name!r})") for name in COMMANDS]
+    cases.append(("eager", EAGER))
+
+    print(f"{'명령':<10} {'import':>9} {'실행':>9}  가장 무거운 import")
+    for name, code in cases:
+        imports_ms, wall_ms, top = best_of(code, args.repeat)
+        print(f"{name:<10} {imports_ms:7.0f}ms {wall_ms:7.0f}ms  {', '.join(top)}")
+
+if __name__ == "__main__":
+    main()
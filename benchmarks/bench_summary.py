@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+summarize_by_branch: 람다 집계(개선 전) vs 네이티브 집계 + 범주형 컬럼 비교
+
+합성 이력(기본 200만 행)으로 처리량을 재고, 두 결과가 같은지 확인한다.
+
+사용법:
+    python benchmarks/bench_summary.py --rows 2000000
+"""
+
+import argparse
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import numpy as np
+import pandas as pd
+import make_report
+
+def summarize_by_branch_before(df: pd.DataFrame):
+    """개선 전 make_report.summarize_by_branch"""
+    grp = df.groupby("branch", dropna=False)
+    summary = grp.agg(
+        checks=("keyword", "count"),
+        found=("rank_local_num", lambda s: s.notna().sum()),
+        avg_rank=("rank_local_num", lambda s: s[s.notna()].mean() if s.notna().any() else None),
+        best_rank=("rank_local_num", lambda s: s[s.notna()].min() if s.notna().any() else None),
+    ).reset_index()
+    summary["coverage_%"] = (summary["found"] / summary["checks"] * 100).round(1)
+    summary = summary.sort_values(by=["avg_rank","coverage_%"], ascending=[True, False], na_position="last")
+    return summary
+
+def make_history(rows: int, branches: int, keywords: int, seed=0):
+    rng = np.random.default_rng(seed)
+    ranks = rng.integers(1, 51, rows).astype(float)
+    ranks[rng.random(rows) < 0.4] = np.nan
+    return pd.DataFrame({
+        "branch": np.array([f"지점{i}" for i in range(branches)], dtype=object)[rng.integers(0, branches, rows)],
+        "keyword": np.array([f"키워드{i} 한의원" for i in range(keywords)], dtype=object)[rng.integers(0, keywords, rows)],
+        "rank_local_num": ranks,
+    })
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rows", type=int, default=2_000_000)
+    ap.add_argument("--branches", type=int, default=300)
+    ap.add_argument("--keywords", type=int, default=600)
+    args = ap.parse_args()
+
+    df = make_history(args.rows, args.branches, args.keywords)
+
+    t0 = time.perf_counter()
+    before = summarize_by_branch_before(df)
+    t_before = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    dfc = df.copy()
+    for col in ("branch", "keyword"):
+        dfc[col] = dfc[col].astype("category")
+    t_cat = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    after = make_report.summarize_by_branch(dfc)
+    t_after = time.perf_counter() - t0
+
+    after_cmp = after.assign(branch=after["branch"].astype(object)).reset_index(drop=True)
+    pd.testing.assert_frame_equal(before.reset_index(drop=True), after_cmp, check_dtype=False)
+
+    n = args.rows
+    print(f"{n:,}행, 지점 {args.branches}개")
+    print(f"람다 집계:    {t_before:.2f}초 ({n / t_before / 1e6:.1f}M행/초)")
+    print(f"네이티브 집계: {t_after:.2f}초 ({n / t_after / 1e6:.1f}M행/초), 범주형 변환 {t_cat:.2f}초 별도")
+
+if __name__ == "__main__":
+    main()
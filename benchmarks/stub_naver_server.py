@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+네이버 Local Search API 스텁 서버 (벤치마크/오프라인 테스트용)
+
+사용법:
+    python benchmarks/stub_naver_server.py --port 8765 --latency 0.05
+    NAVER_LOCAL_API_URL=http://127.0.0.1:8765/v1/search/local.json python main.py --async
+"""
+
+import argparse
+import http.server
+import json
+import threading
+import time
+import zlib
+from collections import deque
+from urllib.parse import urlparse, parse_qs
+
+TOTAL_RESULTS = 60    # 검색어마다 돌려줄 전체 결과 수
+
+def target_rank(query: str) -> int:
+    """검색어별로 고정된 '함소아한의원' 노출 순위 (MAX_CHECK 밖일 수도 있음)"""
+    return zlib.crc32(query.encode("utf-8")) % 70 + 1
+
+def make_item(query: str, rank: int) -> dict:
+    area = query.replace("한의원", "").strip()
+    if rank == target_rank(query):
+        title = f"<b>함소아한의원</b> {area}"
+    else:
+        title = f"{area} 한의원 {rank}"
+    return {
+        "title": title,
+        "link": f"https://example.com/{rank}",
+        "category": "한의학>한의원",
+        "description": "",
+        "telephone": "",
+        "address": f"{area} {rank}번지",
+        "roadAddress": f"{area}로 {rank}",
+        "mapx": "0",
+        "mapy": "0",
+    }
+
+class StubHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    latency = 0.0
+    quota = 0.0           # 0이면 무제한, 아니면 초당 허용 요청 수
+    max_display = 5       # 실제 API처럼 display 상한
+    max_start = 1000      # start 상한 (넘으면 400)
+    _window = deque()
+    _lock = threading.Lock()
+
+    def log_message(self, format, *args):
+        pass
+
+    def _throttled(self) -> bool:
+        if not self.quota:
+            return False
+        with self._lock:
+            now = time.monotonic()
+            while self._window and now - self._window[0] > 1.0:
+                self._window.popleft()
+            if len(self._window) >= self.quota:
+                return True
+            self._window.append(now)
+            return False
+
+    def _send_json(self, status: int, payload: dict):
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        parsed = urlparse(self.path)
+        if parsed.path != "/v1/search/local.json":
+            self._send_json(404, {"errorMessage": "Not Found", "errorCode": "404"})
+            return
+        if self.latency:
+            time.sleep(self.latency)
+        if self._throttled():
+            self._send_json(429, {"errorMessage": "Rate limit exceeded.", "errorCode": "012"})
+            return
+
+        qs = parse_qs(parsed.query)
+        query = qs.get("query", [""])[0]
+        start = int(qs.get("start", ["1"])[0])
+        display = min(int(qs.get("display", ["5"])[0]), self.max_display)
+        if start > self.max_start:
+            self._send_json(400, {"errorMessage": "Invalid start value", "errorCode": "SE03"})
+            return
+        ranks = range(start, min(start + display, TOTAL_RESULTS + 1))
+        self._send_json(200, {
+            "lastBuildDate": time.strftime("%a, %d %b %Y %H:%M:%S +0900"),
+            "total": TOTAL_RESULTS,
+            "start": start,
+            "display": len(ranks),
+            "items": [make_item(query, r) for r in ranks],
+        })
+
+def make_server(port: int = 8765, latency: float = 0.0, quota: float = 0.0, max_display: int = 5,
+                max_start: int = 1000):
+    handler = type("Handler", (StubHandler,), {
+        "latency": latency, "quota": quota, "max_display": max_display, "max_start": max_start,
+        "_window": deque(), "_lock": threading.Lock(),
+    })
+    return http.server.ThreadingHTTPServer(("127.0.0.1", port), handler)
+
+def start_in_background(**kwargs):
+    """스텁 서버를 데몬 스레드로 띄우고 (server, base_url)을 반환"""
+    server = make_server(**kwargs)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    host, port = server.server_address
+    return server, f"http://{host}:{port}/v1/search/local.json"
+
+def main():
+    ap = argparse.ArgumentParser(description="네이버 Local Search API 스텁 서버")
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--latency", type=float, default=0.05, help="응답 지연(초)")
+    ap.add_argument("--quota", type=float, default=0.0, help="초당 허용 요청 수 (초과 시 429)")
+    ap.add_argument("--max-display", type=int, default=5, help="display 상한")
+    ap.add_argument("--max-start", type=int, default=1000, help="start 상한 (1이면 페이지 넘김 불가)")
+    args = ap.parse_args()
+
+    server = make_server(args.port, args.latency, args.quota, args.max_display, args.max_start)
+    print(f"스텁 서버: http://127.0.0.1:{args.port}/v1/search/local.json")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
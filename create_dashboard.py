@@ -1,41 +1,66 @@
-import csv
-import json
-import glob
 import os
+import tempfile
 from datetime import datetime
+from html import escape
+from urllib.parse import parse_qs
 
-def create_web_dashboard():
-    """웹 대시보드 HTML 생성"""
-    
-    # 최신 데이터 로드
-    result_files = glob.glob("results_*.csv")
-    if not result_files:
-        print("결과 파일이 없습니다.")
-        return
-    
-    latest_file = max(result_files, key=os.path.getctime)
-    
-    # 데이터 읽기
-    ranks_data = []
-    with open(latest_file, 'r', encoding='utf-8-sig') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            rank = row['rank_local'].strip()
-            ranks_data.append({
-                'branch': row['branch'],
-                'keyword': row['keyword'],
-                'rank': int(rank) if rank and rank.isdigit() else None,
-                'title': row.get('match_title', ''),
-                'address': row.get('match_address', '')
-            })
-    
-    # 통계 계산
-    total_branches = len(ranks_data)
-    ranked_branches = [r for r in ranks_data if r['rank'] is not None]
-    top5_branches = [r for r in ranked_branches if r['rank'] <= 5]
-    
-    # HTML 생성
-    html_content = f"""
+from results_store import STORE_PATH, ResultsStore
+from rank_changes import change_counts, load_latest_changes
+from daily_summary import summarize
+
+DASHBOARD_PATH = 'dashboard.html'
+
+def _change_dict(change):
+    if change is None:
+        return None
+    return {'kind': change.kind, 'prev_rank': change.prev_rank, 'delta': change.delta, 'baseline': change.baseline}
+
+def build_payload(run, records, changes=()):
+    """/api/data 응답 dict (run: RunInfo, records: RankRecord 목록, changes: 직전 회차 대비 RankChange 목록)"""
+    by_key = {(c.keyword, c.branch): c for c in changes}
+    ranks_data = [{
+        'branch': r.branch,
+        'keyword': r.keyword,
+        'rank': r.rank,
+        'title': r.title,
+        'address': r.address,
+        'link': r.link,
+        'telephone': r.telephone,
+        'change': _change_dict(by_key.get((r.keyword, r.branch)))
+    } for r in records]
+
+    return {
+        'data': ranks_data,
+        'stats': summarize(records).stats(),
+        'changes': change_counts(changes),
+        'last_update': datetime.now().strftime('%Y년 %m월 %d일 %H:%M'),
+        'file_name': os.path.basename(run.source_file)
+    }
+
+def _date_param(value):
+    """YYYYMMDD 또는 YYYY-MM-DD → YYYYMMDD (비어 있으면 None)"""
+    if not value:
+        return None
+    date = value.replace('-', '')
+    try:
+        datetime.strptime(date, '%Y%m%d')
+    except ValueError:
+        raise ValueError(f"날짜는 YYYYMMDD 또는 YYYY-MM-DD 형식이어야 합니다: {value}")
+    return date
+
+def build_history(query, store_path=STORE_PATH):
+    """/api/history 응답 dict. query는 URL 쿼리 문자열 (branch, keyword, from, to, bucket=day|week|month)"""
+    params = parse_qs(query)
+    get = lambda key: (params.get(key) or [None])[0]
+    bucket = get('bucket') or 'day'
+    since, until = _date_param(get('from')), _date_param(get('to'))
+    with ResultsStore(store_path) as store:
+        series = store.rank_history(get('branch'), get('keyword'), since, until, bucket)
+    return {'bucket': bucket, 'from': since, 'to': until, 'series': series}
+
+# 페이지 템플릿: 정적인 앞부분(CSS)과 뒷부분(JS)은 모듈을 읽을 때 한 번만 만들어 두고
+# 실행마다 바뀌는 헤더/통계와 순위 카드만 채워 넣는다
+_PAGE_HEAD = """
 <!DOCTYPE html>
 <html lang="ko">
 <head>
@@ -43,98 +68,98 @@ def create_web_dashboard():
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>네이버 지역 순위 대시보드</title>
     <style>
-        * {{ margin: 0; padding: 0; box-sizing: border-box; }}
-        body {{ 
+        * { margin: 0; padding: 0; box-sizing: border-box; }
+        body { 
             font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
             background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
             min-height: 100vh;
             padding: 20px;
-        }}
-        .container {{ 
+        }
+        .container { 
             max-width: 1200px; 
             margin: 0 auto; 
             background: white;
             border-radius: 20px;
             box-shadow: 0 20px 40px rgba(0,0,0,0.1);
             overflow: hidden;
-        }}
-        .header {{ 
+        }
+        .header { 
             background: linear-gradient(135deg, #4facfe 0%, #00f2fe 100%);
             color: white; 
             padding: 30px; 
             text-align: center;
-        }}
-        .header h1 {{ font-size: 2.5em; margin-bottom: 10px; }}
-        .header p {{ font-size: 1.2em; opacity: 0.9; }}
-        .stats {{ 
+        }
+        .header h1 { font-size: 2.5em; margin-bottom: 10px; }
+        .header p { font-size: 1.2em; opacity: 0.9; }
+        .stats { 
             display: grid; 
             grid-template-columns: repeat(auto-fit, minmax(250px, 1fr));
             gap: 20px;
             padding: 30px;
             background: #f8f9fa;
-        }}
-        .stat-card {{ 
+        }
+        .stat-card { 
             background: white;
             padding: 25px;
             border-radius: 15px;
             text-align: center;
             box-shadow: 0 5px 15px rgba(0,0,0,0.08);
             transition: transform 0.3s ease;
-        }}
-        .stat-card:hover {{ transform: translateY(-5px); }}
-        .stat-number {{ font-size: 2.5em; font-weight: bold; color: #4facfe; }}
-        .stat-label {{ font-size: 1.1em; color: #666; margin-top: 5px; }}
-        .ranks-section {{ padding: 30px; }}
-        .section-title {{ 
+        }
+        .stat-card:hover { transform: translateY(-5px); }
+        .stat-number { font-size: 2.5em; font-weight: bold; color: #4facfe; }
+        .stat-label { font-size: 1.1em; color: #666; margin-top: 5px; }
+        .ranks-section { padding: 30px; }
+        .section-title { 
             font-size: 1.8em; 
             margin-bottom: 20px; 
             color: #333;
             border-bottom: 3px solid #4facfe;
             padding-bottom: 10px;
-        }}
-        .ranks-grid {{ 
+        }
+        .ranks-grid { 
             display: grid; 
             grid-template-columns: repeat(auto-fill, minmax(300px, 1fr));
             gap: 20px;
             margin-top: 20px;
-        }}
-        .rank-card {{ 
+        }
+        .rank-card { 
             background: white;
             border: 1px solid #e0e0e0;
             border-radius: 12px;
             padding: 20px;
             transition: all 0.3s ease;
-        }}
-        .rank-card:hover {{ 
+        }
+        .rank-card:hover { 
             border-color: #4facfe;
             box-shadow: 0 8px 25px rgba(79, 172, 254, 0.15);
-        }}
-        .rank-badge {{ 
+        }
+        .rank-badge { 
             display: inline-block;
             padding: 5px 15px;
             border-radius: 20px;
             color: white;
             font-weight: bold;
             margin-bottom: 10px;
-        }}
-        .rank-1 {{ background: #FFD700; }}
-        .rank-2-3 {{ background: #C0C0C0; }}
-        .rank-4-5 {{ background: #CD7F32; }}
-        .rank-other {{ background: #666; }}
-        .branch-name {{ font-size: 1.3em; font-weight: bold; color: #333; }}
-        .keyword {{ color: #666; margin: 5px 0; }}
-        .no-rank {{ 
+        }
+        .rank-1 { background: #FFD700; }
+        .rank-2-3 { background: #C0C0C0; }
+        .rank-4-5 { background: #CD7F32; }
+        .rank-other { background: #666; }
+        .branch-name { font-size: 1.3em; font-weight: bold; color: #333; }
+        .keyword { color: #666; margin: 5px 0; }
+        .no-rank { 
             background: #f8f9fa;
             border: 1px dashed #ccc;
             opacity: 0.7;
-        }}
-        .footer {{ 
+        }
+        .footer { 
             background: #333;
             color: white;
             text-align: center;
             padding: 20px;
-        }}
-        .refresh-btn {{ 
+        }
+        .refresh-btn { 
             background: #4facfe;
             color: white;
             border: none;
@@ -144,33 +169,42 @@ def create_web_dashboard():
             cursor: pointer;
             margin: 20px;
             transition: background 0.3s ease;
-        }}
-        .refresh-btn:hover {{ background: #369ef7; }}
+        }
+        .refresh-btn:hover { background: #369ef7; }
+        .rank-card[data-branch] { cursor: pointer; }
+        .trend { margin-top: 10px; }
+        .trend svg { display: block; background: #f8f9fa; border-radius: 8px; }
+        .trend-label { font-size: 0.85em; color: #888; margin-top: 4px; }
+        .rank-change { display: inline-block; margin-left: 8px; font-size: 0.9em; font-weight: bold; }
+        .rank-change.up, .rank-change.entered { color: #e74c3c; }
+        .rank-change.down, .rank-change.dropped { color: #3498db; }
     </style>
 </head>
 <body>
-    <div class="container">
+"""
+
+_SUMMARY_TEMPLATE = """    <div class="container">
         <div class="header">
             <h1>🏥 함소아한의원 네이버 지역 순위</h1>
-            <p>마지막 업데이트: {datetime.now().strftime('%Y년 %m월 %d일 %H:%M')}</p>
+            <p>마지막 업데이트: {last_update}</p>
             <button class="refresh-btn" onclick="location.reload()">🔄 새로고침</button>
         </div>
         
         <div class="stats">
             <div class="stat-card">
-                <div class="stat-number">{total_branches}</div>
+                <div class="stat-number">{total}</div>
                 <div class="stat-label">전체 지점</div>
             </div>
             <div class="stat-card">
-                <div class="stat-number">{len(ranked_branches)}</div>
+                <div class="stat-number">{ranked}</div>
                 <div class="stat-label">순위 진입</div>
             </div>
             <div class="stat-card">
-                <div class="stat-number">{len(top5_branches)}</div>
+                <div class="stat-number">{top5}</div>
                 <div class="stat-label">TOP 5 진입</div>
             </div>
             <div class="stat-card">
-                <div class="stat-number">{len(ranked_branches)/total_branches*100:.1f}%</div>
+                <div class="stat-number">{rate:.1f}%</div>
                 <div class="stat-label">진입률</div>
             </div>
         </div>
@@ -179,44 +213,8 @@ def create_web_dashboard():
             <h2 class="section-title">🎯 순위 현황</h2>
             <div class="ranks-grid">
 """
-    
-    # 순위가 있는 지점들 먼저 (순위순으로 정렬)
-    sorted_ranked = sorted(ranked_branches, key=lambda x: x['rank'])
-    for branch_data in sorted_ranked:
-        rank = branch_data['rank']
-        if rank == 1:
-            rank_class = "rank-1"
-            badge_text = f"🥇 {rank}위"
-        elif rank <= 3:
-            rank_class = "rank-2-3"
-            badge_text = f"🥈 {rank}위"
-        elif rank <= 5:
-            rank_class = "rank-4-5"
-            badge_text = f"🥉 {rank}위"
-        else:
-            rank_class = "rank-other"
-            badge_text = f"📍 {rank}위"
-        
-        html_content += f"""
-                <div class="rank-card">
-                    <div class="rank-badge {rank_class}">{badge_text}</div>
-                    <div class="branch-name">{branch_data['branch']}</div>
-                    <div class="keyword">{branch_data['keyword']}</div>
-                </div>
-"""
-    
-    # 순위가 없는 지점들
-    no_rank_branches = [r for r in ranks_data if r['rank'] is None]
-    for branch_data in no_rank_branches:
-        html_content += f"""
-                <div class="rank-card no-rank">
-                    <div class="rank-badge rank-other">❌ 순위없음</div>
-                    <div class="branch-name">{branch_data['branch']}</div>
-                    <div class="keyword">{branch_data['keyword']}</div>
-                </div>
-"""
-    
-    html_content += """
+
+_PAGE_TAIL = """
             </div>
         </div>
         
@@ -229,28 +227,54 @@ def create_web_dashboard():
         // 실시간 데이터 로딩 함수
         async function loadRealTimeData() {
             try {
-                const response = await fetch('/api/data');
-                const data = await response.json();
-                
-                if (data.error) {
-                    console.error('데이터 로드 실패:', data.error);
-                    return;
-                }
-                
-                // 통계 업데이트
-                updateStats(data.stats);
-                
-                // 순위 데이터 업데이트
-                updateRanks(data.data);
-                
-                // 마지막 업데이트 시간 업데이트
-                updateLastUpdateTime(data.last_update);
-                
+                const response = await fetch('/api/data', { cache: 'no-cache' });  // ETag로 재검증, 안 바뀌었으면 304
+                applyData(await response.json());
             } catch (error) {
                 console.error('API 호출 실패:', error);
             }
         }
         
+        // 받은 데이터를 화면에 반영
+        function applyData(data) {
+            if (data.error) {
+                console.error('데이터 로드 실패:', data.error);
+                return;
+            }
+            
+            // 통계 업데이트
+            updateStats(data.stats);
+            
+            // 순위 데이터 업데이트
+            updateRanks(data.data);
+            
+            // 마지막 업데이트 시간 업데이트
+            updateLastUpdateTime(data.last_update);
+        }
+        
+        // 서버가 새 데이터를 밀어주면(/api/stream) 바로 반영.
+        // 스트림을 못 쓰는 경우(simple_server, 동시 접속 초과 등)에만 30초 폴링
+        let pollTimer = null;
+        function startPolling() {
+            if (!pollTimer) {
+                pollTimer = setInterval(loadRealTimeData, 30000);
+            }
+        }
+        
+        function connectStream() {
+            if (!window.EventSource) {
+                startPolling();
+                return;
+            }
+            const source = new EventSource('/api/stream');
+            source.addEventListener('ranks', event => applyData(JSON.parse(event.data)));
+            source.onerror = () => {
+                // 일시적인 끊김은 브라우저가 알아서 다시 연결한다. 거절당했으면(CLOSED) 폴링으로
+                if (source.readyState === EventSource.CLOSED) {
+                    startPolling();
+                }
+            };
+        }
+        
         // 통계 업데이트
         function updateStats(stats) {
             const statNumbers = document.querySelectorAll('.stat-number');
@@ -293,8 +317,8 @@ def create_web_dashboard():
                 }
                 
                 htmlContent += `
-                    <div class="rank-card">
-                        <div class="rank-badge ${rankClass}">${badgeText}</div>
+                    <div class="rank-card" data-branch="${escapeAttr(branchData.branch)}" data-keyword="${escapeAttr(branchData.keyword)}">
+                        <div class="rank-badge ${rankClass}">${badgeText}</div>${changeBadge(branchData.change)}
                         <div class="branch-name">${branchData.branch}</div>
                         <div class="keyword">${branchData.keyword}</div>
                     </div>
@@ -304,8 +328,8 @@ def create_web_dashboard():
             // 순위가 없는 지점들
             noRankBranches.forEach(branchData => {
                 htmlContent += `
-                    <div class="rank-card no-rank">
-                        <div class="rank-badge rank-other">❌ 순위없음</div>
+                    <div class="rank-card no-rank" data-branch="${escapeAttr(branchData.branch)}" data-keyword="${escapeAttr(branchData.keyword)}">
+                        <div class="rank-badge rank-other">❌ 순위없음</div>${changeBadge(branchData.change)}
                         <div class="branch-name">${branchData.branch}</div>
                         <div class="keyword">${branchData.keyword}</div>
                     </div>
@@ -315,6 +339,20 @@ def create_web_dashboard():
             ranksGrid.innerHTML = htmlContent;
         }
         
+        // 직전 수집 대비 변화 (▲N / ▼N / NEW / OUT)
+        function changeBadge(change) {
+            if (!change) return '';
+            let text;
+            if (change.kind === 'entered') {
+                text = 'NEW';
+            } else if (change.kind === 'dropped') {
+                text = `OUT (직전 ${change.prev_rank}위)`;
+            } else {
+                text = change.delta > 0 ? `▲${change.delta}` : `▼${-change.delta}`;
+            }
+            return `<span class="rank-change ${change.kind}">${text}</span>`;
+        }
+        
         // 마지막 업데이트 시간 업데이트
         function updateLastUpdateTime(timeString) {
             const timeElement = document.querySelector('.header p');
@@ -323,24 +361,186 @@ def create_web_dashboard():
             }
         }
         
+        function escapeAttr(value) {
+            return String(value).replace(/&/g, '&amp;').replace(/"/g, '&quot;').replace(/</g, '&lt;');
+        }
+        
+        // 카드를 누르면 최근 90일 순위 추이 (/api/history, 하루 단위로 줄인 값)
+        document.addEventListener('click', async function(event) {
+            const card = event.target.closest('.rank-card');
+            if (!card || !card.dataset.branch) return;
+            const existing = card.querySelector('.trend');
+            if (existing) {
+                existing.remove();
+                return;
+            }
+            const from = new Date(Date.now() - 90 * 86400000).toISOString().slice(0, 10);
+            const params = new URLSearchParams({
+                branch: card.dataset.branch, keyword: card.dataset.keyword, from: from, bucket: 'day'
+            });
+            try {
+                const response = await fetch('/api/history?' + params, { cache: 'no-cache' });
+                const data = await response.json();
+                const series = (data.series || [])[0];
+                card.appendChild(renderTrend(series ? series.points : []));
+            } catch (error) {
+                console.error('추이 조회 실패:', error);
+            }
+        });
+        
+        // 일별 평균 순위 꺾은선 (1위가 위쪽)
+        function renderTrend(points) {
+            const box = document.createElement('div');
+            box.className = 'trend';
+            const ranked = points.filter(p => p.mean !== null);
+            if (ranked.length < 2) {
+                box.textContent = '추이 데이터가 부족합니다';
+                return box;
+            }
+            const width = 260, height = 60;
+            const maxRank = Math.max(...ranked.map(p => p.mean), 5);
+            const x = i => (i / (points.length - 1)) * width;
+            const y = rank => ((rank - 1) / (maxRank - 1)) * (height - 4) + 2;
+            const line = points
+                .map((p, i) => p.mean === null ? null : `${x(i).toFixed(1)},${y(p.mean).toFixed(1)}`)
+                .filter(Boolean).join(' ');
+            const best = Math.min(...ranked.map(p => p.min));
+            const last = points[points.length - 1].last;
+            box.innerHTML = `
+                <svg width="${width}" height="${height}"><polyline points="${line}" fill="none" stroke="#4facfe" stroke-width="2"/></svg>
+                <div class="trend-label">${points.length}일 · 최고 ${best}위 · 최근 ${last === null ? '순위없음' : last + '위'}</div>
+            `;
+            return box;
+        }
+        
         // 페이지 로드 시 초기 데이터 로드
         document.addEventListener('DOMContentLoaded', function() {
             loadRealTimeData();
+            connectStream();
         });
-        
-        // 30초마다 실시간 데이터 업데이트
-        setInterval(loadRealTimeData, 30000);
-        
-        // 5분마다 전체 페이지 새로고침 (백업)
-        setTimeout(() => location.reload(), 300000);
     </script>
 </body>
 </html>
 """
+
+def _rank_badge(rank):
+    """순위에 맞는 (배지 클래스, 배지 문구)"""
+    if rank == 1:
+        return "rank-1", f"🥇 {rank}위"
+    if rank <= 3:
+        return "rank-2-3", f"🥈 {rank}위"
+    if rank <= 5:
+        return "rank-4-5", f"🥉 {rank}위"
+    return "rank-other", f"📍 {rank}위"
+
+def _change_badge(change):
+    """직전 수집 대비 변화 표시 (▲N / ▼N / NEW / OUT). 변화가 없으면 빈 문자열"""
+    if change is None:
+        return ""
+    if change.kind == "entered":
+        text = "NEW"
+    elif change.kind == "dropped":
+        text = f"OUT (직전 {change.prev_rank}위)"
+    else:
+        text = f"▲{change.delta}" if change.delta > 0 else f"▼{-change.delta}"
+    return f'<span class="rank-change {change.kind}">{text}</span>'
+
+CARD_CHUNK = 1000   # 카드를 이 개수씩 join해서 내보낸다 (큰 대시보드도 메모리에 한꺼번에 올리지 않게)
+
+def iter_cards(records, chunk=CARD_CHUNK, changes=()):
+    """순위 카드 HTML 조각 (RankRecord 목록). 순위 있는 지점을 순위순으로 먼저, 순위없음은 뒤에
+
+    changes(RankChange 목록)가 있으면 바뀐 카드의 배지 옆에 변화를 표시한다.
+    """
+    by_key = {(c.keyword, c.branch): c for c in changes}
+    ranked_branches = sorted((r for r in records if r.rank is not None), key=lambda x: x.rank)
+    badges = {}
+    cards = []
+    append = cards.append
+    
+    # 순위가 있는 지점들
+    for branch_data in ranked_branches:
+        rank = branch_data.rank
+        badge = badges.get(rank)
+        if badge is None:
+            badge = badges[rank] = _rank_badge(rank)
+        change = _change_badge(by_key.get((branch_data.keyword, branch_data.branch))) if by_key else ""
+        append(f"""
+                <div class="rank-card" data-branch="{escape(branch_data.branch)}" data-keyword="{escape(branch_data.keyword)}">
+                    <div class="rank-badge {badge[0]}">{badge[1]}</div>{change}
+                    <div class="branch-name">{branch_data.branch}</div>
+                    <div class="keyword">{branch_data.keyword}</div>
+                </div>
+""")
+        if len(cards) >= chunk:
+            yield "".join(cards)
+            cards.clear()
     
-    # 파일 저장
-    with open('dashboard.html', 'w', encoding='utf-8') as f:
-        f.write(html_content)
+    # 순위가 없는 지점들
+    for branch_data in records:
+        if branch_data.rank is None:
+            change = _change_badge(by_key.get((branch_data.keyword, branch_data.branch))) if by_key else ""
+            append(f"""
+                <div class="rank-card no-rank" data-branch="{escape(branch_data.branch)}" data-keyword="{escape(branch_data.keyword)}">
+                    <div class="rank-badge rank-other">❌ 순위없음</div>{change}
+                    <div class="branch-name">{branch_data.branch}</div>
+                    <div class="keyword">{branch_data.keyword}</div>
+                </div>
+""")
+            if len(cards) >= chunk:
+                yield "".join(cards)
+                cards.clear()
+    
+    if cards:
+        yield "".join(cards)
+
+def iter_dashboard(records, changes=()):
+    """대시보드 HTML을 조각 단위로 내보낸다 (정적 앞부분, 헤더/통계, 카드 묶음들, 정적 뒷부분)"""
+    
+    # 통계 계산 (daily_summary와 같은 집계)
+    stats = summarize(records).stats()
+    
+    yield _PAGE_HEAD
+    yield _SUMMARY_TEMPLATE.format(
+        last_update=datetime.now().strftime('%Y년 %m월 %d일 %H:%M'),
+        total=stats['total_branches'],
+        ranked=stats['ranked_branches'],
+        top5=stats['top5_branches'],
+        rate=stats['rank_rate'],
+    )
+    yield from iter_cards(records, changes=changes)
+    yield _PAGE_TAIL
+
+def render_dashboard(records, changes=()):
+    """지점별 순위 목록(RankRecord)으로 대시보드 HTML을 만든다"""
+    return "".join(iter_dashboard(records, changes))
+
+def write_dashboard(records, out_path=DASHBOARD_PATH, changes=()):
+    """대시보드 HTML을 임시 파일에 흘려 쓴 뒤 한 번에 교체한다 (읽는 쪽이 반쯤 쓴 파일을 보지 않게)"""
+    directory = os.path.dirname(os.path.abspath(out_path))
+    fd, tmp_path = tempfile.mkstemp(prefix='.dashboard-', suffix='.html.tmp', dir=directory)
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.writelines(iter_dashboard(records, changes))
+        os.chmod(tmp_path, 0o644)   # mkstemp은 0600으로 만든다
+        os.replace(tmp_path, out_path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+def update_dashboard(out_path=DASHBOARD_PATH, store_path=STORE_PATH):
+    """최신 결과를 한 번만 읽어서 대시보드 HTML을 쓰고 /api/data 응답 dict를 돌려준다 (결과 없으면 None)"""
+    run, records, changes = load_latest_changes(store_path)
+    if run is None:
+        return None
+    write_dashboard(records, out_path, changes)
+    return build_payload(run, records, changes)
+
+def create_web_dashboard():
+    """웹 대시보드 HTML 생성"""
+    if update_dashboard() is None:
+        print("결과 파일이 없습니다.")
+        return
     
     print("웹 대시보드가 생성되었습니다: dashboard.html")
     print("브라우저에서 열어서 확인하세요!")
@@ -1,98 +1,216 @@
-import csv
-import glob
-import os
+"""
+일일 요약 리포트
+
+결과 행을 한 번만 훑으면서 (set/dict 카운터) 요약을 쌓는다. 회차 하나 또는 기간 안의 여러 회차를
+저장소 커서에서 바로 흘려 받으므로 전체를 메모리에 올리지 않는다.
+지점 목록도 행마다가 아니라 (지점, 키워드)마다 한 줄(검색 수, 발견 수, 최고 순위, 마지막 순위)로 모은다.
+대시보드/웹서버의 통계(build_payload의 stats)도 같은 RunSummary로 계산한다.
+
+    python daily_summary.py                              최신 회차
+    python daily_summary.py --run results_20250101_0900.csv
+    python daily_summary.py --since 20250101 --until 20250131
+    python daily_summary.py --json                       같은 내용을 JSON으로
+"""
+
+import argparse
+import json
 from datetime import datetime
+from results_store import ResultsStore, STORE_PATH
+from rank_changes import change_counts, print_changes, run_changes
 
-def generate_daily_summary():
-    """일일 요약 리포트 생성"""
-    print("일일 요약 리포트 생성 중...")
-    print("=" * 60)
-    
-    # 가장 최신 results 파일 찾기
-    result_files = glob.glob("results_*.csv")
-    if not result_files:
-        print("결과 파일을 찾을 수 없습니다.")
-        print("먼저 메뉴 4번 '새로운 순위 데이터 수집'을 실행해주세요.")
-        return
-    
-    latest_file = max(result_files, key=os.path.getctime)
-    print(f"분석 파일: {latest_file}")
+class RunSummary:
+    """결과 행(RankRecord)을 하나씩 받아 요약 카운터를 쌓는다"""
+    def __init__(self):
+        self.runs = []              # 요약한 회차 파일들
+        self.rows = 0               # 키워드 검색 수 (결과 행 수)
+        self.ranked = 0
+        self.top5 = 0
+        self.branches = set()
+        self.keyword_stats = {}     # keyword -> [검색 수, 순위 발견 수]
+        self.pairs = {}             # (branch, keyword) -> [검색 수, 순위 발견 수, 최고 순위, 마지막 순위]
+        self.changes = None         # 회차 하나일 때만: 직전 회차 대비 RankChange 목록
+
+    def add(self, r):
+        self.rows += 1
+        self.branches.add(r.branch)
+        stats = self.keyword_stats.get(r.keyword)
+        if stats is None:
+            stats = self.keyword_stats[r.keyword] = [0, 0]
+        stats[0] += 1
+        pair = self.pairs.get((r.branch, r.keyword))
+        if pair is None:
+            pair = self.pairs[(r.branch, r.keyword)] = [0, 0, None, None]
+        pair[0] += 1
+        pair[3] = r.rank
+        if r.rank is not None:
+            self.ranked += 1
+            stats[1] += 1
+            pair[1] += 1
+            if pair[2] is None or r.rank < pair[2]:
+                pair[2] = r.rank
+            if r.rank <= 5:
+                self.top5 += 1
+
+    def add_all(self, records):
+        for r in records:
+            self.add(r)
+        return self
+
+    @property
+    def ranked_branches(self) -> list:
+        """한 번이라도 순위가 나온 (branch, keyword, 검색 수, 발견 수, 최고 순위, 마지막 순위), 최고 순위순"""
+        return sorted(((b, kw, *p) for (b, kw), p in self.pairs.items() if p[1]), key=lambda x: x[4])
+
+    @property
+    def no_rank_branches(self) -> list:
+        """한 번도 순위가 나오지 않은 (branch, keyword, 검색 수)"""
+        return [(b, kw, p[0]) for (b, kw), p in self.pairs.items() if not p[1]]
+
+    @property
+    def rank_rate(self) -> float:
+        return self.ranked / self.rows * 100 if self.rows else 0
+
+    def stats(self) -> dict:
+        """/api/data의 stats (total_branches는 대시보드 카드 수 = 결과 행 수)"""
+        return {
+            'total_branches': self.rows,
+            'ranked_branches': self.ranked,
+            'top5_branches': self.top5,
+            'rank_rate': self.rank_rate,
+        }
+
+    def to_dict(self) -> dict:
+        """--json 출력"""
+        data = {
+            'runs': self.runs,
+            'searches': self.rows,
+            'branches': len(self.branches),
+            'ranked': self.ranked,
+            'no_rank': self.rows - self.ranked,
+            'top5': self.top5,
+            'rank_rate': round(self.rank_rate, 1),
+            'keywords': {kw: {'total': t, 'ranked': f} for kw, (t, f) in self.keyword_stats.items()},
+            'ranked_branches': [{'branch': b, 'rank': best, 'keyword': kw, 'last_rank': last,
+                                 'found': found, 'checks': checks}
+                                for b, kw, checks, found, best, last in self.ranked_branches],
+            'no_rank_branches': [{'branch': b, 'keyword': kw, 'checks': checks}
+                                 for b, kw, checks in self.no_rank_branches],
+        }
+        if self.changes is not None:
+            data['changes'] = change_counts(self.changes)
+            data['change_list'] = [c._asdict() for c in self.changes]
+        return data
+
+def summarize(records) -> RunSummary:
+    """RankRecord 목록(또는 이터레이터)을 한 번 훑은 요약"""
+    return RunSummary().add_all(records)
+
+def load_summary(run_file=None, since=None, until=None, store_path=STORE_PATH):
+    """회차 하나(run_file, 기본은 최신) 또는 기간(since~until)의 요약. 해당 회차가 없으면 None"""
+    with ResultsStore(store_path) as store:
+        store.ensure_legacy_imported()
+        if since or until:
+            runs = store.runs(since, until)
+        else:
+            run = store.run_info(run_file) if run_file else store.latest_run()
+            runs = [run] if run else []
+        if not runs:
+            return None
+        summary = RunSummary()
+        for run in runs:
+            summary.runs.append(run.source_file)
+            summary.add_all(store.iter_records(run.source_file))
+        if len(runs) == 1:
+            summary.changes = run_changes(store, runs[0])
+    return summary
+
+def print_summary(summary: RunSummary):
+    if len(summary.runs) == 1:
+        print(f"분석 파일: {summary.runs[0]}")
+    else:
+        print(f"분석 기간: {summary.runs[0]} ~ {summary.runs[-1]} ({len(summary.runs)}회 수집)")
     print(f"생성 시간: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     print("=" * 60)
-    
-    # 데이터 분석
-    total_keywords = 0
-    total_branches = 0
-    ranked_branches = []
-    no_rank_branches = []
-    keyword_stats = {}
-    
-    with open(latest_file, 'r', encoding='utf-8-sig') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            branch = row['branch']
-            rank = row['rank_local'].strip()
-            keyword = row['keyword']
-            
-            total_keywords += 1
-            if branch not in [b[0] for b in ranked_branches + no_rank_branches]:
-                total_branches += 1
-            
-            # 키워드별 통계
-            if keyword not in keyword_stats:
-                keyword_stats[keyword] = {'total': 0, 'ranked': 0}
-            keyword_stats[keyword]['total'] += 1
-            
-            if rank and rank != '':
-                ranked_branches.append((branch, rank, keyword))
-                keyword_stats[keyword]['ranked'] += 1
-            else:
-                no_rank_branches.append((branch, keyword))
-    
+
     # 요약 정보 출력
     print("전체 현황")
     print("-" * 30)
-    print(f"총 키워드 검색: {total_keywords}회")
-    print(f"총 지점 수: {total_branches}개")
-    print(f"순위 발견: {len(ranked_branches)}개")
-    print(f"순위 없음: {len(no_rank_branches)}개")
-    print(f"순위 발견률: {len(ranked_branches)/total_keywords*100:.1f}%")
+    print(f"총 키워드 검색: {summary.rows}회")
+    print(f"총 지점 수: {len(summary.branches)}개")
+    print(f"순위 발견: {summary.ranked}개")
+    print(f"순위 없음: {summary.rows - summary.ranked}개")
+    print(f"순위 발견률: {summary.rank_rate:.1f}%")
     print()
-    
+
     # 키워드별 상세 분석
     print("키워드별 분석")
     print("-" * 30)
-    for keyword, stats in keyword_stats.items():
-        success_rate = stats['ranked'] / stats['total'] * 100
-        print(f"  {keyword}: {stats['ranked']}/{stats['total']} ({success_rate:.1f}%)")
+    for keyword, (total, ranked) in summary.keyword_stats.items():
+        success_rate = ranked / total * 100
+        print(f"  {keyword}: {ranked}/{total} ({success_rate:.1f}%)")
     print()
-    
-    # 순위가 있는 지점들 (순위순으로 정렬)
+
+    # 순위가 있는 지점들 (순위순으로 정렬, 기간 요약이면 최고 순위 기준)
+    ranked_branches = summary.ranked_branches
     if ranked_branches:
         print("순위 발견된 지점들 (순위순)")
         print("-" * 30)
-        ranked_branches.sort(key=lambda x: int(x[1]))
-        for branch, rank, keyword in ranked_branches:
-            print(f"  {rank}위: {branch} ({keyword})")
+        for branch, keyword, checks, found, best, last in ranked_branches:
+            line = f"  {best}위: {branch} ({keyword})"
+            if checks > 1:
+                now = f"{last}위" if last is not None else "순위없음"
+                line += f" - 최근 {now}, {found}/{checks}회 발견"
+            print(line)
         print()
-    
+
     # 순위가 없는 지점들
+    no_rank_branches = summary.no_rank_branches
     if no_rank_branches:
         print("순위 없는 지점들")
         print("-" * 30)
-        for branch, keyword in no_rank_branches:
-            print(f"  {branch} ({keyword})")
+        for branch, keyword, checks in no_rank_branches:
+            print(f"  {branch} ({keyword})" + (f" - {checks}회 모두 순위없음" if checks > 1 else ""))
         print()
-    
+
+    # 직전 수집 대비 순위 변화 (수집할 때 계산해 둔 것)
+    if summary.changes is not None:
+        print_changes(summary.changes)
+        print()
+
     # 권장사항
     print("권장사항")
     print("-" * 30)
-    if len(ranked_branches) > 0:
+    if summary.ranked > 0:
         print("순위가 있는 지점들의 SEO 최적화를 더 강화하세요.")
-    if len(no_rank_branches) > 0:
+    if summary.ranked < summary.rows:
         print("순위가 없는 지점들의 네이버 플레이스 정보를 점검하세요.")
     print("정기적인 순위 모니터링을 위해 주 2-3회 데이터 수집을 권장합니다.")
-    
+
+def generate_daily_summary(argv=None):
+    """일일 요약 리포트 생성"""
+    ap = argparse.ArgumentParser(description="일일 요약 리포트")
+    ap.add_argument("--run", help="요약할 결과 파일 이름 (기본: 최신 회차)")
+    ap.add_argument("--since", help="기간 요약 시작 날짜 YYYYMMDD (포함)")
+    ap.add_argument("--until", help="기간 요약 끝 날짜 YYYYMMDD (포함)")
+    ap.add_argument("--json", action="store_true", help="요약을 JSON으로 출력")
+    args = ap.parse_args(argv)
+
+    if not args.json:
+        print("일일 요약 리포트 생성 중...")
+        print("=" * 60)
+
+    # 최신 회차는 결과 저장소의 회차 목록에서 바로 찾음
+    summary = load_summary(args.run, args.since, args.until)
+    if args.json:
+        print(json.dumps(summary.to_dict() if summary else {"error": "결과가 없습니다."},
+                         ensure_ascii=False, indent=2))
+        return
+    if summary is None:
+        print("결과 파일을 찾을 수 없습니다.")
+        print("먼저 메뉴 4번 '새로운 순위 데이터 수집'을 실행해주세요.")
+        return
+
+    print_summary(summary)
     print("\n" + "=" * 60)
     print("일일 요약 리포트 완료!")
 
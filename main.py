@@ -1,47 +1,177 @@
-import os, csv, time, datetime, re
+import os, csv, time, datetime, argparse, asyncio, threading
 import requests
-import pandas as pd
-from urllib.parse import quote
-from dotenv import load_dotenv
 import urllib3
-urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+from naver_client import NaverLocalClient, ApiWindow, load_window, POOL_SIZE, RETRY_STATUS
+from response_cache import ResponseCache, CACHE_TTL_SEC
+from results_store import ResultsStore
+from result_journal import ResultJournal, PART_SUFFIX
+from rank_changes import detect_run_changes, change_counts, KIND_LABELS
+from rank_matcher import PatternMatcher, strip_html, item_fields, item_haystack
 
 # ---- Config ----
 MAX_CHECK = 50        # 최대 50위까지 확인
-PAGE_SIZE = 5         # Local API는 5개씩 반환(문서 단위)
+PAGE_SIZE = 5         # Local API는 5개씩 반환(문서 단위). API 조회 범위를 재지 못했을 때의 기본값
+DEFAULT_WINDOW = ApiWindow(PAGE_SIZE, True)
 PAUSE_SEC = 1.0       # 요청 간 지연(레이트리밋/안정성)
+RATE_LIMIT_RPS = 10.0 # 비동기 모드 초당 요청 한도(네이버 검색 API 쿼터)
+ASYNC_WORKERS = 8     # 비동기 모드 동시 처리 키워드 수
+MIN_RPS = 0.5         # 적응형 리미터 하한
+MAX_RPS = 20.0        # 적응형 리미터 상한
+RPS_STEP = 0.1        # 정상 응답 1건마다 올리는 초당 요청 수 (AI)
+RPS_BACKOFF = 0.5     # 429/타임아웃 시 곱하는 비율 (MD)
+SLOW_RESPONSE_SEC = 2.0   # 이보다 느린 응답은 과부하 신호로 보고 살짝 감속
+THROTTLE_RETRIES = 5  # 429/타임아웃 시 같은 페이지 재시도 횟수
 
-load_dotenv()
-CID = os.getenv("NAVER_CLIENT_ID")
-CSECRET = os.getenv("NAVER_CLIENT_SECRET")
-HEADERS = {"X-Naver-Client-Id": CID or "", "X-Naver-Client-Secret": CSECRET or ""}
-
-def naver_local_search(query: str, start: int = 1, display: int = PAGE_SIZE) -> dict:
-    """네이버 Local Search API 호출 (광고 제외 결과)"""
-    if not CID or not CSECRET:
-        raise RuntimeError("NAVER_CLIENT_ID / NAVER_CLIENT_SECRET 값을 .env에 설정하세요.")
-    if not query.strip():
-        raise RuntimeError(f"검색어가 비어있습니다: '{query}'")
-    url = f"https://openapi.naver.com/v1/search/local.json?query={quote(query)}&start={start}&display={display}"
-    # print(f"[DEBUG] API 호출: {url}")
-    r = requests.get(url, headers=HEADERS, timeout=10, verify=False)
-    r.raise_for_status()
-    return r.json()
-
-def strip_html(s: str) -> str:
-    return re.sub(r"<.*?>", "", s or "")
+class TokenBucket:
+    """초당 rate개씩 채워지는 토큰 버킷. 스레드/코루틴이 함께 쓰는 전역 레이트리미터"""
+    def __init__(self, rate: float, capacity: int = 1):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._stamp = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _reserve(self) -> float:
+        """토큰 하나를 예약하고, 그 토큰을 쓸 수 있을 때까지 기다려야 할 시간(초)을 반환"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._stamp) * self.rate)
+            self._stamp = now
+            self._tokens -= 1
+            return -self._tokens / self.rate if self._tokens < 0 else 0.0
+
+    def acquire(self):
+        wait = self._reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self):
+        wait = self._reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+class AdaptiveRateLimiter(TokenBucket):
+    """AIMD 레이트리미터: 정상 응답이면 rate를 조금씩 올리고, 429/타임아웃이면 크게 줄인다
+
+    한 번 밀릴 때 동시에 나가 있던 요청들이 줄줄이 429를 받으므로, 마지막 감속 전에 보낸
+    요청의 429/타임아웃은 같은 혼잡으로 보고 다시 줄이지 않는다 (혼잡 한 번에 감속 한 번).
+    """
+    def __init__(self, rate: float, capacity: int = 1, min_rate: float = MIN_RPS, max_rate: float = MAX_RPS):
+        super().__init__(rate, capacity)
+        self.min_rate = min_rate
+        self.max_rate = max(max_rate, rate)
+        self.throttle_events = 0
+        self._last_backoff = float("-inf")
+
+    def on_success(self, latency: float):
+        with self._lock:
+            if latency > SLOW_RESPONSE_SEC:
+                self.rate = max(self.min_rate, self.rate * 0.9)
+            else:
+                self.rate = min(self.max_rate, self.rate + RPS_STEP)
+
+    def on_throttle(self, reason: str, sent: float = None):
+        """sent: 그 요청을 보낸 시각 (time.monotonic). 없으면 항상 감속"""
+        with self._lock:
+            if sent is not None and sent < self._last_backoff:
+                return
+            self._last_backoff = time.monotonic()
+            self.throttle_events += 1
+            self.rate = max(self.min_rate, self.rate * RPS_BACKOFF)
+            # 쌓인 토큰도 버려서 바로 다음 요청부터 감속
+            self._tokens = min(self._tokens, 0.0)
+            rate = self.rate
+        print(f"[THROTTLE] {reason} → {rate:.1f} req/s로 감속 (누적 {self.throttle_events}회)")
+
+def _throttle_reason(e: Exception):
+    """429/타임아웃이면 사유 문자열, 아니면 None"""
+    if isinstance(e, requests.Timeout):
+        return "타임아웃"
+    # 전송 계층 재시도를 다 쓴 읽기 타임아웃은 ConnectionError(MaxRetryError(ReadTimeoutError))로 온다
+    if isinstance(e, requests.ConnectionError) and e.args and isinstance(
+            getattr(e.args[0], "reason", None), urllib3.exceptions.ReadTimeoutError):
+        return "타임아웃"
+    if isinstance(e, requests.HTTPError) and e.response is not None and e.response.status_code == 429:
+        return "429"
+    return None
+
+# 공유 API 클라이언트 (main()에서 설정, 없으면 캐시 없이 기본 설정으로 생성)
+_client = None
+
+def configure_client(use_cache: bool = True, max_age: float = None, pool_size: int = POOL_SIZE):
+    """커넥션 풀/응답 캐시를 가진 API 클라이언트를 만든다. max_age(초)는 캐시 읽기 유효 시간"""
+    global _client
+    if _client is not None:
+        _client.close()
+    cache = ResponseCache() if use_cache else None
+    # 429와 읽기 타임아웃은 전송 계층에서 재시도하지 않고 수집기(적응형 리미터)가 직접 처리
+    _client = NaverLocalClient(pool_size=pool_size, cache=cache, max_age=max_age,
+                               retry_status=tuple(c for c in RETRY_STATUS if c != 429), read_retries=False)
+    return _client
+
+def get_client() -> NaverLocalClient:
+    global _client
+    if _client is None:
+        _client = NaverLocalClient()
+    return _client
+
+def naver_local_search(query: str, start: int = 1, display: int = PAGE_SIZE, limiter: "TokenBucket" = None) -> dict:
+    """캐시에 있으면 캐시 응답, 없으면 (리미터 대기 후) API 호출.
+    적응형 리미터를 넘기면 429/타임아웃은 감속 후 재시도한다."""
+    client = get_client()
+    data = client.cached(query, start, display)
+    if data is not None:
+        return data
+    if not isinstance(limiter, AdaptiveRateLimiter):
+        if limiter:
+            limiter.acquire()
+        return client.search(query, start, display)
+    for attempt in range(THROTTLE_RETRIES + 1):
+        limiter.acquire()
+        t0 = time.monotonic()
+        try:
+            data = client.search(query, start, display)
+        except Exception as e:
+            reason = _throttle_reason(e)
+            if reason is None or attempt == THROTTLE_RETRIES:
+                raise
+            limiter.on_throttle(reason, t0)
+            continue
+        limiter.on_success(time.monotonic() - t0)
+        return data
+
+async def naver_local_search_async(query: str, start: int, display: int, limiter: TokenBucket) -> dict:
+    """naver_local_search의 비동기 버전. 캐시 적중은 리미터 토큰을 쓰지 않는다"""
+    client = get_client()
+    data = client.cached(query, start, display)
+    if data is not None:
+        return data
+    if not isinstance(limiter, AdaptiveRateLimiter):
+        if limiter:
+            await limiter.acquire_async()
+        return await asyncio.to_thread(client.search, query, start, display)
+    for attempt in range(THROTTLE_RETRIES + 1):
+        await limiter.acquire_async()
+        t0 = time.monotonic()
+        try:
+            data = await asyncio.to_thread(client.search, query, start, display)
+        except Exception as e:
+            reason = _throttle_reason(e)
+            if reason is None or attempt == THROTTLE_RETRIES:
+                raise
+            limiter.on_throttle(reason, t0)
+            continue
+        limiter.on_success(time.monotonic() - t0)
+        return data
 
 def find_first_rank_local(items: list, patterns: list):
     """응답 items에서 patterns(소문자 부분일치)와 처음 맞는 아이템의 순위/핵심 필드 반환"""
     patterns = [p.strip().lower() for p in patterns if p.strip()]
     for idx, it in enumerate(items, start=1):
-        title = strip_html(it.get("title", ""))
-        link  = it.get("link", "")
-        addr  = " ".join([it.get("roadAddress", ""), it.get("address", "")]).strip()
-        phone = it.get("telephone", "")
-        haystack = " ".join([title, link, addr, phone]).lower()
+        fields = item_fields(it)
+        haystack = item_haystack(fields)
         if any(p in haystack for p in patterns):
-            return idx, {"title": title, "link": link, "address": addr, "telephone": phone}
+            return idx, fields
     return None, None
 
 def load_keywords(csv_path="keywords.csv"):
@@ -68,60 +198,258 @@ def load_keywords(csv_path="keywords.csv"):
         raise RuntimeError("keywords.csv에 데이터가 없습니다.")
     return rows
 
-def get_rank_local(query: str, patterns: list):
+def normalize_keyword(keyword: str) -> str:
+    """중복 검색 판단용 키: 공백 정리 + 소문자"""
+    return " ".join(keyword.split()).lower()
+
+def group_rows(rows):
+    """정규화한 검색어별로 행 인덱스를 묶는다 (첫 등장 순서 유지)"""
+    groups = {}
+    for i, row in enumerate(rows):
+        groups.setdefault(normalize_keyword(row["keyword"]), []).append(i)
+    return list(groups.values())
+
+class CallStats:
+    """API 호출 수 집계 (조기 종료로 아낀 호출 수 포함)"""
+    def __init__(self):
+        self.calls = 0
+        self.saved = 0
+
+    def record(self, pages: int, found: bool, max_pages: int):
+        self.calls += pages
+        if found:
+            self.saved += max_pages - pages
+
+class SharedRankSearch:
+    """검색어 하나의 결과 페이지를 받아가며, 같은 검색어를 쓰는 지점(owners)들을 함께 매칭.
+    matcher는 키워드 시트 전체로 한 번 만든 PatternMatcher (owner = 행 번호)
+    window(ApiWindow)만큼 한 번에 받고, 확인하는 순위는 window.depth(MAX_CHECK)까지"""
+    def __init__(self, matcher: PatternMatcher, owners: list, window: ApiWindow = DEFAULT_WINDOW):
+        self.matcher = matcher
+        self.owners = owners
+        self.display = window.display
+        self.depth = window.depth(MAX_CHECK)
+        self.max_pages = window.max_calls(MAX_CHECK)
+        self.found = {}
+        self.offset = 0
+        self.pages = 0
+        self.done = False
+
+    @property
+    def next_start(self) -> int:
+        # 받은 개수 다음부터 (API가 display보다 적게 줘도 건너뛰는 순위가 없게)
+        return 1 + self.offset
+
+    def feed(self, items: list):
+        self.pages += 1
+        pending = set(self.owners) - self.found.keys()
+        for idx, it in enumerate(items, start=1):
+            rank = self.offset + idx
+            if rank > self.depth or not pending:
+                break
+            fields = item_fields(it)
+            for owner in self.matcher.match(item_haystack(fields)) & pending:
+                self.found[owner] = (rank, fields)
+                pending.discard(owner)
+        self.offset += len(items)
+        self.done = (not pending or not items
+                     or self.offset >= self.depth or self.pages >= self.max_pages)
+
+    def results(self, stats: CallStats = None):
+        if stats:
+            stats.record(self.pages, len(self.found) == len(self.owners), self.max_pages)
+        return [self.found.get(owner, (None, {})) for owner in self.owners]
+
+def run_search(query: str, search: SharedRankSearch, limiter: TokenBucket = None):
+    """search가 끝날 때까지 페이지를 받아 넣는다. 모두 찾으면 남은 페이지는 요청하지 않는다."""
+    while not search.done:
+        data = naver_local_search(query, search.next_start, search.display, limiter)
+        search.feed(data.get("items", []))
+
+async def run_search_async(query: str, search: SharedRankSearch, limiter: TokenBucket):
+    """run_search의 비동기 버전. 페이지 요청은 스레드에서, 대기는 공유 리미터로 처리"""
+    while not search.done:
+        data = await naver_local_search_async(query, search.next_start, search.display, limiter)
+        search.feed(data.get("items", []))
+
+def get_ranks_shared(query: str, pattern_lists: list, limiter: TokenBucket = None, stats: CallStats = None,
+                     window: ApiWindow = DEFAULT_WINDOW):
+    """검색 결과를 한 번만 받아 여러 지점의 (순위, 핵심 필드)를 찾는다."""
+    search = SharedRankSearch(PatternMatcher(pattern_lists), list(range(len(pattern_lists))), window)
+    run_search(query, search, limiter or TokenBucket(1 / PAUSE_SEC))
+    return search.results(stats)
+
+def get_rank_local(query: str, patterns: list, limiter: TokenBucket = None, stats: CallStats = None):
     """지역+한의원 검색 시, patterns(플레이스URL/지점명 등)과 매칭되는 첫 순위를 찾는다."""
-    all_items = []
-    for start in range(1, MAX_CHECK + 1, PAGE_SIZE):
-        data = naver_local_search(query, start=start, display=PAGE_SIZE)
-        items = data.get("items", [])
-        if not items:
-            break
-        all_items.extend(items)
-        time.sleep(PAUSE_SEC)
-        if len(all_items) >= MAX_CHECK:
-            break
-
-    rank, hit = find_first_rank_local(all_items, patterns)
-    if rank is None:
-        return None, {}
-    return rank, hit
-
-def main():
-    rows = load_keywords("keywords.csv")
-    ts = datetime.datetime.now().strftime("%Y%m%d_%H%M")
-    out_path = f"results_{ts}.csv"
+    return get_ranks_shared(query, [patterns], limiter, stats)[0]
+
+def _log_failure(q: str, e: Exception):
+    if isinstance(e, requests.HTTPError):
+        print(f"[ERROR] API 실패: {e}")
+    else:
+        print(f"[ERROR] {q} 처리 중 오류: {e}")
+
+def _deliver(rows, idxs, found, ok, ranks, sink):
+    """검색어 하나의 결과를 로그로 남기고 sink로 넘기거나(ranks 없이) ranks에 채운다"""
+    for i, rank_hit in zip(idxs, found):
+        print(f"[{rows[i]['keyword']}/{rows[i]['branch']}] rank={rank_hit[0]}")
+    if sink is not None:
+        sink(idxs, found, ok)
+    else:
+        for i, rank_hit in zip(idxs, found):
+            ranks[i] = rank_hit
 
-    results = []
-    for row in rows:
-        q = row["keyword"]
-        branch = row["branch"]
-        pats = row["patterns"]
+def collect_sync(rows, limiter: TokenBucket, stats: CallStats = None, sink=None,
+                 window: ApiWindow = DEFAULT_WINDOW):
+    """검색어별로 한 번씩 순서대로 조회하고, 같은 검색어의 지점들은 결과를 공유.
+    sink(idxs, found, ok)를 주면 검색어마다 바로 넘기고 결과를 모아 두지 않는다 (None 반환)"""
+    ranks = None if sink is not None else [(None, {})] * len(rows)
+    matcher = PatternMatcher([row["patterns"] for row in rows])
+    for idxs in group_rows(rows):
+        query = rows[idxs[0]]["keyword"]
+        ok = True
         try:
-            rank, hit = get_rank_local(q, pats)
-        except requests.HTTPError as e:
-            print(f"[ERROR] API 실패: {e}")
-            rank, hit = None, {}
+            search = SharedRankSearch(matcher, idxs, window)
+            run_search(query, search, limiter)
+            found = search.results(stats)
         except Exception as e:
-            print(f"[ERROR] {q} 처리 중 오류: {e}")
-            rank, hit = None, {}
-
-        results.append({
-            "timestamp": ts,
-            "keyword": q,
-            "branch": branch,
-            "rank_local": rank if rank is not None else "",
-            "match_title": (hit.get("title") if hit else ""),
-            "match_link": (hit.get("link") if hit else ""),
-            "match_address": (hit.get("address") if hit else ""),
-            "match_telephone": (hit.get("telephone") if hit else "")
-        })
-        print(f"[{q}/{branch}] rank={rank}")
-
-    df = pd.DataFrame(results, columns=[
-        "timestamp","keyword","branch","rank_local","match_title","match_link","match_address","match_telephone"
-    ])
-    df.to_csv(out_path, index=False, encoding="utf-8-sig")
+            _log_failure(query, e)
+            found = [(None, {})] * len(idxs)
+            ok = False
+        _deliver(rows, idxs, found, ok, ranks, sink)
+    return ranks
+
+async def collect_async(rows, limiter: TokenBucket, workers: int = ASYNC_WORKERS,
+                        stats: CallStats = None, sink=None, window: ApiWindow = DEFAULT_WINDOW):
+    """검색어들을 동시에 조회. 전체 속도는 공유 리미터(초당 요청 수)가 결정 (sink는 collect_sync와 같음)"""
+    sem = asyncio.Semaphore(workers)
+    ranks = None if sink is not None else [(None, {})] * len(rows)
+    matcher = PatternMatcher([row["patterns"] for row in rows])
+
+    async def one(idxs):
+        query = rows[idxs[0]]["keyword"]
+        ok = True
+        async with sem:
+            try:
+                search = SharedRankSearch(matcher, idxs, window)
+                await run_search_async(query, search, limiter)
+                found = search.results(stats)
+            except Exception as e:
+                _log_failure(query, e)
+                found = [(None, {})] * len(idxs)
+                ok = False
+        _deliver(rows, idxs, found, ok, ranks, sink)
+
+    await asyncio.gather(*(one(idxs) for idxs in group_rows(rows)))
+    return ranks
+
+def parse_args(argv=None):
+    ap = argparse.ArgumentParser(description="네이버 지역 검색 순위 수집")
+    ap.add_argument("--keywords", default="keywords.csv", help="키워드 CSV 경로")
+    ap.add_argument("--async", dest="async_mode", action="store_true",
+                    help="키워드를 동시에 조회 (전역 레이트리미터 사용)")
+    ap.add_argument("--rps", type=float, default=RATE_LIMIT_RPS,
+                    help=f"비동기 모드 시작 초당 요청 수 (기본 {RATE_LIMIT_RPS})")
+    ap.add_argument("--max-rps", type=float, default=MAX_RPS,
+                    help=f"적응형 리미터가 올릴 수 있는 최대 초당 요청 수 (기본 {MAX_RPS})")
+    ap.add_argument("--workers", type=int, default=ASYNC_WORKERS,
+                    help=f"비동기 모드 동시 처리 키워드 수 (기본 {ASYNC_WORKERS})")
+    ap.add_argument("--max-age", type=float, default=CACHE_TTL_SEC,
+                    help=f"캐시된 응답을 재사용할 최대 경과 시간(초, 기본 {CACHE_TTL_SEC}). 0이면 항상 새로 조회")
+    ap.add_argument("--no-cache", action="store_true", help="응답 캐시를 읽지도 쓰지도 않음")
+    ap.add_argument("--resume", action="store_true",
+                    help="중단된 수집(results_*.csv.part)을 이어서: 이미 끝난 (keyword, branch)는 건너뜀")
+    ap.add_argument("--reprobe", action="store_true",
+                    help="저장해 둔 API 조회 범위(display/start)를 무시하고 다시 잰다")
+    ap.add_argument("--pool-size", type=int, default=POOL_SIZE,
+                    help=f"keep-alive 연결 풀 크기 (기본 {POOL_SIZE})")
+    return ap.parse_args(argv)
+
+def result_record(ts: str, row: dict, rank, hit, depth: int = MAX_CHECK) -> dict:
+    """결과 CSV 한 행 (check_depth: 몇 위까지 확인했는지)"""
+    return {
+        "timestamp": ts,
+        "keyword": row["keyword"],
+        "branch": row["branch"],
+        "rank_local": rank if rank is not None else "",
+        "match_title": (hit.get("title") if hit else ""),
+        "match_link": (hit.get("link") if hit else ""),
+        "match_address": (hit.get("address") if hit else ""),
+        "match_telephone": (hit.get("telephone") if hit else ""),
+        "check_depth": depth
+    }
+
+def open_journal(resume: bool) -> ResultJournal:
+    """결과 저널을 연다. resume이면 가장 최근에 중단된 .part를 이어 쓰고, 없으면 새로 시작"""
+    if resume:
+        journal = ResultJournal.latest_unfinished()
+        if journal is not None:
+            print(f"이어서 수집: {journal.part_path} (완료 {journal.written}행)")
+            return journal
+        print("이어서 수집할 중단된 결과가 없어 새로 시작합니다.")
+    ts = datetime.datetime.now().strftime("%Y%m%d_%H%M")
+    # 같은 분에 또 수집하면 results_{ts}-2.csv, -3 ... (앞 회차의 파일/저장소 기록을 덮지 않게)
+    out_path, n = f"results_{ts}.csv", 2
+    with ResultsStore() as store:
+        while (os.path.exists(out_path) or os.path.exists(out_path + PART_SUFFIX)
+               or store.run_info(out_path) is not None):
+            out_path, n = f"results_{ts}-{n}.csv", n + 1
+    return ResultJournal(out_path)
+
+def main(argv=None):
+    args = parse_args(argv)
+    rows = load_keywords(args.keywords)
+    with ResultsStore() as store:
+        # 저장소 도입 전 CSV를 이번 결과 파일이 생기기 전에 가져와 둔다 (그래야 순위 변화에서 직전 회차를 찾는다)
+        store.ensure_legacy_imported()
+    journal = open_journal(args.resume)
+    todo = [row for row in rows if (row["keyword"], row["branch"]) not in journal.done]
+    if len(todo) < len(rows):
+        print(f"이미 끝난 {len(rows) - len(todo)}개 행은 건너뜁니다.")
+
+    client = configure_client(not args.no_cache, args.max_age, max(args.pool_size, args.workers))
+    window = load_window(client, [row["keyword"] for row in todo], MAX_CHECK, args.reprobe)
+    depth = window.depth(MAX_CHECK)
+    print(f"API 조회 범위: 한 번에 {window.display}개, {depth}위까지 확인 (검색어당 최대 {window.max_calls(MAX_CHECK)}회 호출)")
+    if depth < MAX_CHECK:
+        print(f"[WARN] API가 {depth}위까지만 돌려줍니다. {depth}위 밖은 '순위없음'으로 기록됩니다.")
+
+    def sink(idxs, found, ok):
+        # 검색어가 끝날 때마다 행 단위로 저널에 기록 (flush까지)
+        for i, (rank, hit) in zip(idxs, found):
+            journal.add(i, result_record(journal.ts, todo[i], rank, hit, depth), ok)
+
+    stats = CallStats()
+    started = time.perf_counter()
+    try:
+        if args.async_mode:
+            limiter = AdaptiveRateLimiter(args.rps, capacity=max(1, int(args.rps)), max_rate=args.max_rps)
+            asyncio.run(collect_async(todo, limiter, args.workers, stats, sink, window))
+        else:
+            limiter = AdaptiveRateLimiter(1 / PAUSE_SEC, max_rate=args.max_rps)
+            collect_sync(todo, limiter, stats, sink, window)
+    except BaseException:
+        journal.close()
+        print(f"수집이 중단되었습니다. 'python main.py --resume'으로 이어서 수집할 수 있습니다 ({journal.part_path})")
+        raise
+    elapsed = time.perf_counter() - started
+
+    out_path = journal.finish([(row["keyword"], row["branch"]) for row in rows])
+    with ResultsStore() as store:
+        if store.import_csv(out_path) == 0:
+            raise RuntimeError(f"{out_path}는 이미 결과 저장소에 있는 회차라서 가져오지 않았습니다.")
+        run = store.run_info(os.path.basename(out_path))
+        changes = detect_run_changes(store, run) if run else []
+    print(f"수집 시간: {elapsed:.1f}초 ({len(todo)}개 행, 검색어 {len(group_rows(todo))}개)")
+    cache_hits = client.cache.hits if client.cache else 0
+    print(f"API 호출: {client.requests}회 (캐시 적중 {cache_hits}회, 조기 종료로 {stats.saved}회 절약)")
+    if client.requests:
+        print(f"평균 응답 시간: {client.avg_latency_ms:.0f}ms")
+    print(f"최종 요청 속도: {limiter.rate:.1f} req/s (스로틀 {limiter.throttle_events}회)")
+    counts = change_counts(changes)
+    print("순위 변화: " + ", ".join(f"{KIND_LABELS[k]} {n}" for k, n in counts.items()))
     print(f"저장 완료 → {out_path}")
+    return out_path
 
 if __name__ == "__main__":
     main()
@@ -1,68 +1,264 @@
-import os, glob
+import argparse, os, time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
 import pandas as pd
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font
+from results_store import ResultsStore, RankChange, COLUMNS
+from rank_changes import load_latest_changes
 
 OUT_XLSX = "report_local_rank.xlsx"
+STATE_PATH = "report_state.pkl"   # 증분 리포트용 지점별 누적 집계
+RAW_PARQUET_PATH = "report_local_rank_raw.parquet"
 
-def load_all_results(pattern="results_*.csv"):
-    files = sorted(glob.glob(pattern))
-    frames = []
-    for f in files:
-        try:
-            df = pd.read_csv(f)
-            df["source_file"] = os.path.basename(f)
-            frames.append(df)
-        except Exception as e:
-            print(f"[WARN] {f}: {e}")
-    if not frames:
-        raise RuntimeError("결과 CSV가 없습니다. 먼저 main.py를 실행해 results_*.csv를 생성하세요.")
-    out = pd.concat(frames, ignore_index=True)
+REPORT_JOBS = 2                   # 요약 시트를 계산할 작업 프로세스 수
+SUMMARY_SHEETS = ("Summary_ByBranch", "TopKeywords", "Needs_Attention", "Changes")
+RAW_MODES = ("auto", "sheet", "month", "parquet")
+RAW_SPLIT_ROWS = 500_000          # auto일 때 Raw가 이보다 많으면 달별 시트로 나눈다
+EXCEL_MAX_ROWS = 1_048_576        # 시트 하나의 최대 행 수 (머리글 포함). 넘으면 _2, _3 시트로 이어 쓴다
+RAW_CHUNK = 100_000               # Parquet 한 번에 쓰는 행 수
+RAW_COLUMNS = COLUMNS + ["source_file", "rank_local_num", "date", "time"]
 
+def load_all_results(since=None, until=None):
+    """결과 저장소에서 기간(YYYYMMDD, 양끝 포함)의 결과를 읽는다"""
+    with ResultsStore() as store:
+        store.ensure_legacy_imported()
+        out = store.read_frame(since, until)
+    if out.empty:
+        raise RuntimeError("결과가 없습니다. 먼저 main.py를 실행해 순위를 수집하세요.")
+    return _prepare(out)
+
+def _prepare(out: pd.DataFrame):
     # 타입/날짜 보정
     out["rank_local_num"] = pd.to_numeric(out.get("rank_local"), errors="coerce")
-    if "timestamp" in out.columns:
-        out["date"] = out["timestamp"].astype(str).str.slice(0, 8)
-        out["time"] = out["timestamp"].astype(str).str.slice(9, 13)
-    else:
-        out["date"] = ""
-        out["time"] = ""
+    ts = out["timestamp"].fillna("").astype(str)
+    out["date"] = ts.str.slice(0, 8)
+    out["time"] = ts.str.slice(9, 13)
+    # 반복이 많은 문자열 컬럼은 범주형으로 (groupby/정렬이 코드 단위로 동작)
+    for col in ("branch", "keyword"):
+        out[col] = out[col].astype("category")
     return out
 
 def summarize_by_branch(df: pd.DataFrame):
-    grp = df.groupby("branch", dropna=False)
-    summary = grp.agg(
-        checks=("keyword", "count"),
-        found=("rank_local_num", lambda s: s.notna().sum()),
-        avg_rank=("rank_local_num", lambda s: s[s.notna()].mean() if s.notna().any() else None),
-        best_rank=("rank_local_num", lambda s: s[s.notna()].min() if s.notna().any() else None),
-    ).reset_index()
-    summary["coverage_%"] = (summary["found"] / summary["checks"] * 100).round(1)
-    summary = summary.sort_values(by=["avg_rank","coverage_%"], ascending=[True, False], na_position="last")
-    return summary
+    return summary_from_aggregates(branch_aggregates(df))
 
 def top_keywords_per_branch(df: pd.DataFrame, topn=5):
     dfx = df[df["rank_local_num"].notna()].copy()
     dfx["rank_order"] = dfx["rank_local_num"]
     dfx = dfx.sort_values(["branch","rank_order","keyword"])
-    return dfx.groupby("branch").head(topn).drop(columns=["rank_order"])
+    return dfx.groupby("branch", observed=True).head(topn).drop(columns=["rank_order"])
 
 def keywords_needing_attention(df: pd.DataFrame, limit=100):
     need = df[ (df["rank_local_num"].isna()) | (df["rank_local_num"]>=30) ].copy()
     return need.sort_values(["branch","rank_local_num","keyword"]).head(limit)
 
-def run():
-    df = load_all_results()
-    summary = summarize_by_branch(df)
-    tops = top_keywords_per_branch(df, topn=5)
-    attention = keywords_needing_attention(df, limit=100)
-    raw = df.copy()
+def branch_aggregates(df: pd.DataFrame):
+    """지점별 누적 집계 (합쳐서 다시 집계할 수 있는 값만: 건수, 발견 수, 순위 합, 최고 순위)"""
+    return df.groupby("branch", dropna=False, observed=True).agg(
+        checks=("keyword", "count"),
+        found=("rank_local_num", "count"),
+        rank_sum=("rank_local_num", "sum"),
+        best_rank=("rank_local_num", "min"),
+    )
+
+def merge_aggregates(old: pd.DataFrame, new: pd.DataFrame):
+    both = pd.concat([old, new])
+    return both.groupby(level=0, dropna=False, observed=True).agg(
+        {"checks": "sum", "found": "sum", "rank_sum": "sum", "best_rank": "min"})
+
+def summary_from_aggregates(agg: pd.DataFrame):
+    """누적 집계로 Summary_ByBranch 시트를 만든다 (summarize_by_branch와 같은 결과)"""
+    summary = agg.reset_index()
+    summary["avg_rank"] = (summary["rank_sum"] / summary["found"]).where(summary["found"] > 0)
+    summary = summary[["branch", "checks", "found", "avg_rank", "best_rank"]].copy()
+    summary["coverage_%"] = (summary["found"] / summary["checks"] * 100).round(1)
+    summary = summary.sort_values(by=["avg_rank","coverage_%"], ascending=[True, False], na_position="last")
+    return summary
+
+def latest_changes():
+    """가장 최근 회차의 직전 회차 대비 순위 변화 (Changes 시트)"""
+    _, _, changes = load_latest_changes()
+    return pd.DataFrame(changes, columns=RankChange._fields)
+
+def incremental_sheets(rebuild=False):
+    """지난 리포트 이후 새로 쌓인 결과만 읽어 누적 집계에 더하고, 요약 시트 3개를 돌려준다.
+    rebuild면 상태 파일을 무시하고 전체 이력으로 다시 만든다."""
+    state = None
+    if not rebuild and os.path.exists(STATE_PATH):
+        state = pd.read_pickle(STATE_PATH)
+
+    with ResultsStore() as store:
+        store.ensure_legacy_imported()
+        upto = store.max_id()
+        if state is not None and state["last_id"] > upto:
+            print("[WARN] 결과 저장소가 바뀌어 리포트 집계를 다시 만듭니다.")
+            state = None
+        after = state["last_id"] if state is not None else 0
+        new = _prepare(store.read_frame(after_id=after, upto_id=upto))
+
+    if state is None:
+        state = {
+            "agg": branch_aggregates(new),
+            "tops": top_keywords_per_branch(new, topn=5),
+            "attention": keywords_needing_attention(new, limit=100),
+        }
+    elif not new.empty:
+        # 이전 상위 행들 뒤에 새 행을 붙여 다시 고르면 전체 재계산과 같은 결과(동순위는 먼저 들어온 행 우선)
+        state = {
+            "agg": merge_aggregates(state["agg"], branch_aggregates(new)),
+            "tops": top_keywords_per_branch(pd.concat([state["tops"], new], ignore_index=True), topn=5),
+            "attention": keywords_needing_attention(pd.concat([state["attention"], new], ignore_index=True), limit=100),
+        }
+    state["last_id"] = upto
+    if state["agg"].empty:
+        raise RuntimeError("결과가 없습니다. 먼저 main.py를 실행해 순위를 수집하세요.")
+    pd.to_pickle(state, STATE_PATH)
+    print(f"리포트 집계: 새 결과 {len(new)}행 반영")
+    return summary_from_aggregates(state["agg"]), state["tops"], state["attention"]
+
+def summary_sheets(since=None, until=None, rebuild=False):
+    """Summary_ByBranch, TopKeywords, Needs_Attention (작업 프로세스에서 저장소를 직접 읽어 계산)"""
+    if since or until:
+        # 기간을 지정하면 누적 상태와 상관없이 그 기간만 집계
+        df = load_all_results(since, until)
+        return summarize_by_branch(df), top_keywords_per_branch(df, topn=5), keywords_needing_attention(df, limit=100)
+    return incremental_sheets(rebuild)
+
+def _header(ws, columns):
+    cells = []
+    for name in columns:
+        cell = WriteOnlyCell(ws, value=str(name))
+        cell.font = Font(bold=True)
+        cells.append(cell)
+    return cells
+
+def _cell_value(v):
+    # NaN은 빈 칸으로 (pandas to_excel과 같게)
+    if v is None or (isinstance(v, float) and v != v):
+        return None
+    return v
+
+def append_frame(ws, df: pd.DataFrame):
+    """DataFrame을 write_only 시트에 행 단위로 쓴다"""
+    ws.append(_header(ws, df.columns))
+    for row in df.itertuples(index=False, name=None):
+        ws.append([_cell_value(v) for v in row])
+
+class RawSheetWriter:
+    """write_only 시트에 행을 쓰다가 시트 최대 행 수를 넘으면 name_2, name_3 ... 시트로 이어 쓴다"""
+    def __init__(self, wb: Workbook, name: str, columns=RAW_COLUMNS):
+        self.wb = wb
+        self.name = name
+        self.columns = columns
+        self.names = []
+        self._ws = None
+        self._rows = 0
+
+    def append(self, row):
+        if self._ws is None or self._rows >= EXCEL_MAX_ROWS - 1:
+            name = self.name if not self.names else f"{self.name}_{len(self.names) + 1}"
+            self._ws = self.wb.create_sheet(name)
+            self._ws.append(_header(self._ws, self.columns))
+            self.names.append(name)
+            self._rows = 0
+        self._ws.append(row)
+        self._rows += 1
+
+def raw_row(row):
+    """저장소 행(COLUMNS + source_file) → Raw 시트 한 행 (rank_local_num, date, time 추가)"""
+    ts = row[0] or ""
+    return row + (row[3], ts[:8], ts[9:13])
+
+def write_raw_parquet(store: ResultsStore, since=None, until=None, path=RAW_PARQUET_PATH) -> int:
+    """Raw를 Parquet 파일로 (pyarrow 필요). RAW_CHUNK행씩 흘려 쓴다"""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    text, number = pa.string(), pa.int64()
+    schema = pa.schema([(c, number if c in ("rank_local", "check_depth", "rank_local_num") else text)
+                        for c in RAW_COLUMNS])
+    rows = (raw_row(r) for r in store.iter_rows(since, until))
+    total = 0
+    with pq.ParquetWriter(path, schema) as writer:
+        while True:
+            chunk = list(islice(rows, RAW_CHUNK))
+            if not chunk:
+                break
+            arrays = [pa.array(col, type=f.type) for col, f in zip(zip(*chunk), schema)]
+            writer.write_table(pa.Table.from_arrays(arrays, schema=schema))
+            total += len(chunk)
+    return total
+
+def write_raw(wb: Workbook, since=None, until=None, rows=0, mode="auto") -> list:
+    """Raw 데이터를 저장소 커서에서 바로 시트로 흘려 쓴다 (DataFrame을 만들지 않음). 만든 시트 이름 목록"""
+    with ResultsStore() as store:
+        if mode == "parquet":
+            try:
+                count = write_raw_parquet(store, since, until)
+            except ImportError:
+                print("[WARN] pyarrow가 없어 Parquet 대신 달별 Raw 시트로 나눕니다. (pip install pyarrow)")
+                mode = "month"
+            else:
+                ws = wb.create_sheet("Raw")
+                ws.append([f"Raw 데이터 {count}행은 {RAW_PARQUET_PATH} 파일에 있습니다."])
+                print(f"Raw 데이터 → {RAW_PARQUET_PATH} ({count}행)")
+                return ["Raw"]
+
+        if mode == "sheet" or (mode == "auto" and rows <= RAW_SPLIT_ROWS):
+            writer = RawSheetWriter(wb, "Raw")
+            for row in store.iter_rows(since, until):
+                writer.append(raw_row(row))
+            return writer.names
+
+        # 달별 시트 (Raw_YYYY-MM, 날짜 없는 행은 Raw_날짜없음)
+        names = []
+        for month in store.months(since, until):
+            if month is None:
+                writer, rows_iter = RawSheetWriter(wb, "Raw_날짜없음"), store.iter_rows(undated=True)
+            else:
+                lo, hi = max(since or "", month + "01"), min(until or "99999999", month + "31")
+                writer, rows_iter = RawSheetWriter(wb, f"Raw_{month[:4]}-{month[4:]}"), store.iter_rows(lo, hi)
+            for row in rows_iter:
+                writer.append(raw_row(row))
+            names += writer.names
+        return names
+
+def run(since=None, until=None, rebuild=False, raw_mode="auto", jobs=REPORT_JOBS):
+    with ResultsStore() as store:
+        store.ensure_legacy_imported()
+        raw_rows = store.count_rows(since, until)
+    if not raw_rows:
+        raise RuntimeError("결과가 없습니다. 먼저 main.py를 실행해 순위를 수집하세요.")
+
+    started = time.perf_counter()
+    wb = Workbook(write_only=True)   # 시트마다 행을 바로 임시 파일로 흘려 써서 메모리가 일정
+    sheets = {name: wb.create_sheet(name) for name in SUMMARY_SHEETS}
+    with ProcessPoolExecutor(max_workers=max(1, jobs)) as pool:
+        # 요약 시트는 작업 프로세스들이 계산하고, 그동안 여기서는 Raw를 흘려 쓴다
+        summary_job = pool.submit(summary_sheets, since, until, rebuild)
+        changes_job = pool.submit(latest_changes)
+        raw_names = write_raw(wb, since, until, raw_rows, raw_mode)
+        frames = dict(zip(SUMMARY_SHEETS, summary_job.result()))
+        frames["Changes"] = changes_job.result()
+    for name, df in frames.items():
+        append_frame(sheets[name], df)
+    wb.save(OUT_XLSX)
 
-    with pd.ExcelWriter(OUT_XLSX, engine="openpyxl") as xw:
-        summary.to_excel(xw, index=False, sheet_name="Summary_ByBranch")
-        tops.to_excel(xw, index=False, sheet_name="TopKeywords")
-        attention.to_excel(xw, index=False, sheet_name="Needs_Attention")
-        raw.to_excel(xw, index=False, sheet_name="Raw")
+    print(f"생성 완료 → {OUT_XLSX} (시트: {', '.join(SUMMARY_SHEETS + tuple(raw_names))}, "
+          f"Raw {raw_rows}행, {time.perf_counter() - started:.1f}초)")
 
-    print(f"생성 완료 → {OUT_XLSX} (시트: Summary_ByBranch, TopKeywords, Needs_Attention, Raw)")
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="순위 Excel 리포트 생성")
+    ap.add_argument("--since", help="시작 날짜 YYYYMMDD (포함)")
+    ap.add_argument("--until", help="끝 날짜 YYYYMMDD (포함)")
+    ap.add_argument("--rebuild", action="store_true", help="누적 집계를 버리고 전체 이력으로 다시 계산")
+    ap.add_argument("--raw", choices=RAW_MODES, default="auto",
+                    help=f"Raw 데이터 내보내기: auto(기본, {RAW_SPLIT_ROWS}행 넘으면 달별 시트), "
+                         f"sheet(한 시트), month(달별 시트), parquet({RAW_PARQUET_PATH}, pyarrow 필요)")
+    ap.add_argument("--jobs", type=int, default=REPORT_JOBS,
+                    help=f"요약 시트를 계산할 작업 프로세스 수 (기본 {REPORT_JOBS})")
+    args = ap.parse_args(argv)
+    run(args.since, args.until, args.rebuild, args.raw, args.jobs)
 
 if __name__ == "__main__":
-    run()
+    main()
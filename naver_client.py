@@ -0,0 +1,181 @@
+"""
+네이버 Local Search API 클라이언트
+
+requests.Session 하나를 재사용해서 TCP/TLS 연결을 keep-alive로 유지하고,
+429/5xx 응답은 전송 계층(urllib3 Retry)에서 백오프 후 재시도한다.
+
+API가 한 번에 몇 개까지(display), 몇 번째부터(start) 돌려주는지는 probe_window()로 재서
+naver_capability.json에 저장해 두고, 수집기는 그 범위 안에서 가장 적은 호출로 순위를 확인한다.
+"""
+
+import os
+import json
+import time
+import threading
+from typing import NamedTuple
+from urllib.parse import quote
+
+import requests
+import urllib3
+from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+
+load_dotenv()
+CID = os.getenv("NAVER_CLIENT_ID")
+CSECRET = os.getenv("NAVER_CLIENT_SECRET")
+# 로컬 스텁 서버로 테스트할 때 NAVER_LOCAL_API_URL로 교체
+API_URL = os.getenv("NAVER_LOCAL_API_URL", "https://openapi.naver.com/v1/search/local.json")
+
+POOL_SIZE = 8                 # 호스트당 유지할 keep-alive 연결 수
+RETRIES = 3                   # 429/5xx 재시도 횟수
+BACKOFF_SEC = 0.5             # 재시도 간격 (0.5, 1, 2초 ...)
+TIMEOUT_SEC = 10
+RETRY_STATUS = (429, 500, 502, 503, 504)
+
+CAPABILITY_PATH = "naver_capability.json"
+CAPABILITY_TTL_SEC = 7 * 24 * 3600   # 이 기간이 지나면 다시 잰다
+DEFAULT_DISPLAY = 5                   # 재지 못했을 때 쓰는 display (문서상 Local API 상한)
+
+class ApiWindow(NamedTuple):
+    """API가 실제로 지켜 주는 조회 범위"""
+    display: int    # 한 번에 받을 수 있는 결과 수
+    paging: bool    # start를 넘겨 다음 결과를 받을 수 있는지
+
+    def depth(self, want: int) -> int:
+        """want위까지 보고 싶을 때 실제로 확인할 수 있는 순위"""
+        return want if self.paging else min(want, self.display)
+
+    def max_calls(self, want: int) -> int:
+        """검색어 하나를 want위까지 확인하는 데 드는 최대 호출 수"""
+        return -(-self.depth(want) // self.display)
+
+def _is_bad_request(e: requests.HTTPError) -> bool:
+    return e.response is not None and e.response.status_code == 400
+
+class NaverLocalClient:
+    """네이버 Local Search API 클라이언트 (커넥션 풀 + keep-alive + 재시도 + 응답 캐시)"""
+
+    def __init__(self, client_id=CID, client_secret=CSECRET, api_url=API_URL,
+                 pool_size=POOL_SIZE, retries=RETRIES, backoff=BACKOFF_SEC,
+                 timeout=TIMEOUT_SEC, cache=None, max_age=None, retry_status=RETRY_STATUS,
+                 read_retries=None):
+        self.client_id = client_id
+        self.client_secret = client_secret
+        self.api_url = api_url
+        self.timeout = timeout
+        self.cache = cache
+        self.max_age = max_age
+
+        # read_retries=False면 읽기 타임아웃을 재시도하지 않고 requests.ReadTimeout으로 바로 올린다
+        retry = Retry(total=retries, read=read_retries, backoff_factor=backoff, status_forcelist=retry_status,
+                      allowed_methods=frozenset(["GET"]), respect_retry_after_header=True,
+                      raise_on_status=False)
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=retry)
+        self.session = requests.Session()
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.verify = False
+        self.session.headers.update({
+            "X-Naver-Client-Id": client_id or "",
+            "X-Naver-Client-Secret": client_secret or "",
+        })
+
+        # 요청 수/누적 지연 (keep-alive 효과 측정용)
+        self.requests = 0
+        self.elapsed = 0.0
+        self._lock = threading.Lock()
+
+    def cached(self, query: str, start: int, display: int):
+        """캐시에 유효한 응답이 있으면 dict, 없으면 None"""
+        if self.cache is None:
+            return None
+        return self.cache.get(query, start, display, self.max_age)
+
+    def search(self, query: str, start: int = 1, display: int = 5) -> dict:
+        """네이버 Local Search API 호출 (광고 제외 결과). 응답은 캐시에 저장"""
+        if not self.client_id or not self.client_secret:
+            raise RuntimeError("NAVER_CLIENT_ID / NAVER_CLIENT_SECRET 값을 .env에 설정하세요.")
+        if not query.strip():
+            raise RuntimeError(f"검색어가 비어있습니다: '{query}'")
+        url = f"{self.api_url}?query={quote(query)}&start={start}&display={display}"
+        t0 = time.perf_counter()
+        r = self.session.get(url, timeout=self.timeout)
+        with self._lock:
+            self.requests += 1
+            self.elapsed += time.perf_counter() - t0
+        r.raise_for_status()
+        data = r.json()
+        if self.cache is not None:
+            self.cache.put(query, start, display, data)
+        return data
+
+    def probe_window(self, query: str, want: int):
+        """display=want로 한 번, 필요하면 그 다음 start로 한 번 더 불러서 ApiWindow를 잰다.
+
+        결과가 want보다 적은 검색어라서 display 상한을 알 수 없으면 None.
+        """
+        try:
+            first = self.search(query, 1, want)
+        except requests.HTTPError as e:
+            if not _is_bad_request(e) or want <= DEFAULT_DISPLAY:
+                raise
+            first = self.search(query, 1, DEFAULT_DISPLAY)    # display 범위 초과 (400)
+        items = first.get("items", [])
+        total = int(first.get("total") or 0)
+        if len(items) >= want:
+            return ApiWindow(want, True)
+        if not items or total <= len(items):
+            return None
+        display = len(items)
+        try:
+            second = self.search(query, display + 1, display)
+        except requests.HTTPError as e:
+            if not _is_bad_request(e):
+                raise
+            return ApiWindow(display, False)    # start 범위 초과 (400)
+        # start를 무시하고 첫 결과를 다시 주는 경우도 페이지 넘김이 안 되는 것으로 본다
+        page = second.get("items", [])
+        paging = bool(page) and page[0] != items[0] and int(second.get("start") or display + 1) == display + 1
+        return ApiWindow(display, paging)
+
+    @property
+    def avg_latency_ms(self) -> float:
+        return self.elapsed / self.requests * 1000 if self.requests else 0.0
+
+    def close(self):
+        self.session.close()
+        if self.cache is not None:
+            self.cache.close()
+
+def load_window(client: NaverLocalClient, queries, want: int, refresh=False,
+                path=CAPABILITY_PATH, ttl=CAPABILITY_TTL_SEC) -> ApiWindow:
+    """저장해 둔 ApiWindow를 읽고, 없거나 오래됐으면 queries 앞쪽 검색어로 다시 잰다.
+    재지 못하면 DEFAULT_DISPLAY씩 페이지를 넘기는 기본 방식으로 돌아간다 (저장하지 않음)"""
+    if not refresh:
+        try:
+            with open(path, encoding="utf-8") as f:
+                saved = json.load(f)
+            if (saved.get("api_url") == client.api_url and saved.get("want") == want
+                    and time.time() - saved.get("probed_at", 0) < ttl):
+                return ApiWindow(saved["display"], saved["paging"])
+        except (OSError, ValueError, KeyError):
+            pass
+
+    window = None
+    for query in list(dict.fromkeys(queries))[:3]:
+        try:
+            window = client.probe_window(query, want)
+        except Exception as e:
+            print(f"[WARN] API 조회 범위 확인 실패: {e}")
+            break
+        if window is not None:
+            break
+    if window is None:
+        return ApiWindow(DEFAULT_DISPLAY, True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"api_url": client.api_url, "want": want, "display": window.display,
+                   "paging": window.paging, "probed_at": time.time()}, f)
+    return window
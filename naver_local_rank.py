@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+네이버 지역 순위 통합 실행기
+
+    python naver_local_rank.py collect [--async ...]   순위 수집 (main.py)
+    python naver_local_rank.py show                    최신 순위 빠르게 보기 (show_ranks.py)
+    python naver_local_rank.py summary                 일일 요약 리포트 (daily_summary.py)
+    python naver_local_rank.py report [--since ...]    Excel 리포트 (make_report.py)
+    python naver_local_rank.py dashboard               dashboard.html 생성 (create_dashboard.py)
+    python naver_local_rank.py serve [...]             스마트 웹서버 (smart_web_server.py)
+
+pandas/requests 같은 무거운 모듈은 그 명령이 실제로 필요할 때만 불러온다.
+(예: show/summary/dashboard는 표준 라이브러리만으로 시작)
+"""
+
+import argparse
+import importlib
+
+# 명령 → (모듈, 함수, 나머지 인자를 그 모듈의 argparse로 넘기는지, 설명)
+COMMANDS = {
+    "collect":   ("main", "main", True, "순위 수집 (옵션은 main.py와 같음)"),
+    "show":      ("show_ranks", "show_latest_ranks", False, "최신 순위 빠르게 보기"),
+    "summary":   ("daily_summary", "generate_daily_summary", True, "일일 요약 리포트 (옵션은 daily_summary.py와 같음)"),
+    "changes":   ("rank_changes", "main", True, "직전 수집 대비 순위 변화 (옵션은 rank_changes.py와 같음)"),
+    "report":    ("make_report", "main", True, "Excel 리포트 생성 (옵션은 make_report.py와 같음)"),
+    "dashboard": ("create_dashboard", "create_web_dashboard", False, "dashboard.html 생성"),
+    "serve":     ("smart_web_server", "main", True, "스마트 웹서버 (옵션은 smart_web_server.py와 같음)"),
+}
+
+def load_command(name: str):
+    """명령에 해당하는 함수를 돌려준다. 이때 처음으로 그 모듈(과 무거운 의존성)을 불러온다"""
+    module_name, func_name = COMMANDS[name][:2]
+    return getattr(importlib.import_module(module_name), func_name)
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(prog="naver_local_rank", description="네이버 지역 순위 통합 실행기")
+    sub = ap.add_subparsers(dest="command", required=True, metavar="명령")
+    for name, (_, _, forwards, help_text) in COMMANDS.items():
+        # 인자를 넘기는 명령은 --help도 해당 스크립트가 처리하게 둔다
+        sub.add_parser(name, help=help_text, add_help=not forwards)
+    args, rest = ap.parse_known_args(argv)
+
+    forwards = COMMANDS[args.command][2]
+    if rest and not forwards:
+        ap.error(f"'{args.command}' 명령은 추가 인자를 받지 않습니다: {' '.join(rest)}")
+
+    func = load_command(args.command)
+    if forwards:
+        func(rest)
+    else:
+        func()
+
+if __name__ == "__main__":
+    main()
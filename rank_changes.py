@@ -0,0 +1,131 @@
+"""
+순위 변화 감지 (직전 회차 대비 + 최근 며칠 평균 대비)
+
+수집이 끝날 때마다 main.py가 호출한다. 이번 회차와 직전 회차의 결과를 (keyword, branch)로
+맞춰 보고, 달라진 것만 RankChange로 저장한다 (results.sqlite3의 rank_changes).
+비용은 이력 크기와 상관없이 회차 두 개의 행 수에 비례한다.
+최근 평균(baseline)은 daily_ranks에서 (지점, 키워드)별로 기본키 범위 조회로 구한다.
+
+    python rank_changes.py            가장 최근 회차의 변화 보기
+"""
+
+import argparse
+import datetime
+
+from results_store import RankChange, ResultsStore, RunInfo, STORE_PATH
+
+BASELINE_DAYS = 7   # 평균 순위를 낼 최근 기간 (이번 회차 날짜는 빼고)
+KIND_LABELS = {"entered": "순위 진입", "dropped": "순위 이탈", "up": "상승", "down": "하락"}
+
+def compare_runs(current, previous, baseline=None) -> list:
+    """두 회차의 RankRecord 목록 → 달라진 (keyword, branch)의 RankChange 목록 (이번 회차 순서)
+
+    baseline(branch, keyword)을 주면 바뀐 행에만 최근 평균 순위를 붙인다.
+    """
+    # 키워드 시트에 같은 (keyword, branch)가 두 번 있으면 첫 행만 본다
+    prev_ranks = {}
+    for r in previous:
+        prev_ranks.setdefault((r.keyword, r.branch), (r.rank, r.depth))
+    changes = []
+    seen = set()
+    for r in current:
+        key = (r.keyword, r.branch)
+        if key in seen:
+            continue
+        seen.add(key)
+        prev, prev_depth = prev_ranks.get(key, (None, None))
+        if prev == r.rank:
+            continue
+        # 두 회차 중 얕게 확인한 쪽보다 깊은 순위는 다른 쪽에서 보였는지 알 수 없으므로
+        # 진입/이탈로 치지 않는다 (API 조회 범위가 회차마다 달라질 수 있음)
+        depths = [d for d in (prev_depth, r.depth) if d]
+        limit = min(depths) if depths else None
+        if limit is not None and (
+                (prev is None and r.rank is not None and r.rank > limit)
+                or (r.rank is None and prev is not None and prev > limit)):
+            continue
+        if prev is None:
+            kind, delta = "entered", None
+        elif r.rank is None:
+            kind, delta = "dropped", None
+        else:
+            delta = prev - r.rank
+            kind = "up" if delta > 0 else "down"
+        base = baseline(r.branch, r.keyword) if baseline else None
+        changes.append(RankChange(r.keyword, r.branch, kind, prev, r.rank, delta, base))
+    return changes
+
+def detect_run_changes(store: ResultsStore, run: RunInfo, baseline_days=BASELINE_DAYS) -> list:
+    """run을 직전 회차와 비교해서 저장하고 RankChange 목록을 돌려준다 (첫 회차면 빈 목록)"""
+    previous = store.previous_run(run)
+    changes = []
+    if previous is not None:
+        baseline = None
+        if run.timestamp:
+            until = run.timestamp[:8]
+            day = datetime.datetime.strptime(until, "%Y%m%d").date()
+            since = (day - datetime.timedelta(days=baseline_days)).strftime("%Y%m%d")
+            baseline = lambda branch, keyword: store.daily_rank_mean(branch, keyword, since, until)
+        changes = compare_runs(store.run_records(run.source_file),
+                               store.run_records(previous.source_file), baseline)
+    store.save_changes(run.id, previous.id if previous else None, changes)
+    return changes
+
+def run_changes(store: ResultsStore, run: RunInfo) -> list:
+    """저장된 변화가 있으면 그것을, 없으면(예전 회차) 지금 계산해서 저장한다"""
+    changes = store.run_changes(run.id)
+    if changes is None:
+        changes = detect_run_changes(store, run)
+    return changes
+
+def load_latest_changes(path=STORE_PATH, legacy_pattern="results_*.csv"):
+    """load_latest_run()에 직전 회차 대비 변화를 더한 (run, records, changes). 결과가 없으면 (None, [], [])"""
+    with ResultsStore(path) as store:
+        store.ensure_legacy_imported(legacy_pattern)
+        run = store.latest_run()
+        if run is None:
+            return None, [], []
+        return run, store.run_records(run.source_file), run_changes(store, run)
+
+def change_counts(changes) -> dict:
+    """종류별 개수 {"entered": n, "dropped": n, "up": n, "down": n}"""
+    counts = dict.fromkeys(KIND_LABELS, 0)
+    for c in changes:
+        counts[c.kind] += 1
+    return counts
+
+def format_change(c: RankChange) -> str:
+    """사람이 읽는 한 줄 (예: '강남 (강남 한의원): 7위 → 3위 ▲4')"""
+    prev = f"{c.prev_rank}위" if c.prev_rank is not None else "순위없음"
+    now = f"{c.rank}위" if c.rank is not None else "순위없음"
+    mark = {"entered": "NEW", "dropped": "OUT"}.get(c.kind) or (f"▲{c.delta}" if c.delta > 0 else f"▼{-c.delta}")
+    line = f"{c.branch} ({c.keyword}): {prev} → {now} {mark}"
+    if c.baseline is not None:
+        line += f" (최근 평균 {c.baseline:g}위)"
+    return line
+
+def print_changes(changes, limit=None):
+    counts = change_counts(changes)
+    print("순위 변화 (직전 수집 대비)")
+    print("-" * 30)
+    print("  " + ", ".join(f"{KIND_LABELS[k]} {n}" for k, n in counts.items()))
+    order = {"entered": 0, "up": 1, "down": 2, "dropped": 3}
+    shown = sorted(changes, key=lambda c: (order[c.kind], -abs(c.delta or 0)))
+    for c in shown[:limit]:
+        print(f"  {format_change(c)}")
+    if limit is not None and len(shown) > limit:
+        print(f"  ... 외 {len(shown) - limit}건")
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="가장 최근 회차의 순위 변화")
+    ap.add_argument("--limit", type=int, default=None, help="보여줄 최대 건수")
+    args = ap.parse_args(argv)
+    run, _, changes = load_latest_changes()
+    if run is None:
+        print("결과가 없습니다. 먼저 main.py를 실행해 순위를 수집하세요.")
+        return
+    print(f"회차: {run.source_file}")
+    print_changes(changes, args.limit)
+
+if __name__ == "__main__":
+    main()
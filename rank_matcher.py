@@ -0,0 +1,83 @@
+"""
+지점별 target_patterns 다중 매칭 (Aho-Corasick)
+
+키워드 시트 전체의 patterns로 오토마톤을 한 번 만들어 두고,
+검색 결과 아이템마다 정규화한 텍스트를 한 번만 훑어서
+매칭되는 지점(행 번호)들을 한꺼번에 돌려준다.
+"""
+
+import re
+from collections import deque
+
+_TAG_RE = re.compile(r"<.*?>")
+
+def strip_html(s: str) -> str:
+    return _TAG_RE.sub("", s or "")
+
+def item_fields(it: dict) -> dict:
+    """검색 결과 아이템에서 결과 CSV에 남길 핵심 필드"""
+    return {
+        "title": strip_html(it.get("title", "")),
+        "link": it.get("link", ""),
+        "address": " ".join([it.get("roadAddress", ""), it.get("address", "")]).strip(),
+        "telephone": it.get("telephone", ""),
+    }
+
+def item_haystack(fields: dict) -> str:
+    """매칭 대상 텍스트 (소문자)"""
+    return " ".join([fields["title"], fields["link"], fields["address"], fields["telephone"]]).lower()
+
+class PatternMatcher:
+    """여러 지점의 patterns(소문자 부분일치)를 한 번에 찾는 Aho-Corasick 오토마톤
+
+    pattern_lists[i]는 i번 지점(owner)의 patterns.
+    """
+    def __init__(self, pattern_lists: list):
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [set()]
+        for owner, patterns in enumerate(pattern_lists):
+            for p in patterns:
+                p = p.strip().lower()
+                if p:
+                    self._add(p, owner)
+        self._build()
+
+    def _add(self, pattern: str, owner: int):
+        state = 0
+        for ch in pattern:
+            nxt = self._goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append(set())
+            state = nxt
+        self._out[state].add(owner)
+
+    def _build(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                f = self._fail[state]
+                while f and ch not in self._goto[f]:
+                    f = self._fail[f]
+                self._fail[nxt] = self._goto[f].get(ch, 0)
+                self._out[nxt] |= self._out[self._fail[nxt]]
+        self._out = [frozenset(o) for o in self._out]
+
+    def match(self, text: str) -> set:
+        """text에 patterns가 하나라도 들어있는 owner 번호들"""
+        goto, fail, out = self._goto, self._fail, self._out
+        found = set()
+        state = 0
+        for ch in text:
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if out[state]:
+                found |= out[state]
+        return found
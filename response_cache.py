@@ -0,0 +1,78 @@
+"""
+네이버 Local Search 응답 디스크 캐시 (SQLite)
+
+(query, start, display) 단위로 응답 JSON을 저장한다.
+- TTL이 지난 응답은 적중으로 치지 않는다.
+- 저장 개수가 max_entries를 넘으면 가장 오래 안 쓴 응답부터 지운다(LRU).
+"""
+
+import json
+import sqlite3
+import threading
+import time
+
+CACHE_PATH = "naver_cache.sqlite3"
+CACHE_TTL_SEC = 600          # 기본 유효 시간(초)
+CACHE_MAX_ENTRIES = 5000     # 페이지 응답 최대 보관 개수
+
+class ResponseCache:
+    def __init__(self, path=CACHE_PATH, ttl=CACHE_TTL_SEC, max_entries=CACHE_MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                query      TEXT    NOT NULL,
+                start      INTEGER NOT NULL,
+                display    INTEGER NOT NULL,
+                body       TEXT    NOT NULL,
+                fetched_at REAL    NOT NULL,
+                last_used  REAL    NOT NULL,
+                PRIMARY KEY (query, start, display)
+            )""")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_last_used ON responses(last_used)")
+        self._conn.commit()
+
+    def get(self, query: str, start: int, display: int, max_age: float = None):
+        """유효 시간 안의 응답이 있으면 dict, 없으면 None"""
+        max_age = self.ttl if max_age is None else max_age
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT body, fetched_at FROM responses WHERE query=? AND start=? AND display=?",
+                (query, start, display)).fetchone()
+            if row is None or now - row[1] > max_age:
+                self.misses += 1
+                return None
+            self._conn.execute(
+                "UPDATE responses SET last_used=? WHERE query=? AND start=? AND display=?",
+                (now, query, start, display))
+            self._conn.commit()
+            self.hits += 1
+        return json.loads(row[0])
+
+    def put(self, query: str, start: int, display: int, data: dict):
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?)",
+                (query, start, display, json.dumps(data, ensure_ascii=False), now, now))
+            # LRU: 최근 사용 순으로 max_entries개만 남긴다
+            self._conn.execute(
+                "DELETE FROM responses WHERE rowid IN ("
+                " SELECT rowid FROM responses ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,))
+            self._conn.commit()
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
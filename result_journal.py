@@ -0,0 +1,129 @@
+"""
+수집 결과 저널 (results_{ts}.csv.part)
+
+main.py가 검색어 하나를 끝낼 때마다 결과 행을 바로 이어 쓰고 flush한다.
+수집이 끝나면 results_{ts}.csv로 이름을 바꾸고, 중간에 죽으면 .part가 남아서
+`python main.py --resume`으로 끝난 (keyword, branch)는 건너뛰고 이어서 수집한다.
+
+- 비동기 수집은 끝나는 순서가 뒤섞이지만 끝난 행은 기다리지 않고 바로 쓴다
+  (느린 검색어 하나 때문에 메모리에 쌓이거나 --resume에서 다시 조회되지 않게).
+  키워드 시트 순서로 되돌리는 것은 finish()에서 한 번에 한다.
+- API 오류로 못 찾은 행은 저널에 바로 쓰지 않고 finish()에서 맨 뒤에 붙인다.
+  그래서 중간에 죽으면 --resume 때 다시 조회된다.
+"""
+
+import csv
+import glob
+import os
+import re
+
+from results_store import COLUMNS
+
+PART_SUFFIX = ".part"
+_TS_RE = re.compile(r"results_([^-]+)(?:-\d+)?\.csv$")   # 같은 분의 두 번째 회차는 results_{ts}-2.csv
+
+class ResultJournal:
+    def __init__(self, out_path: str, resume: bool = False):
+        self.out_path = out_path
+        self.part_path = out_path + PART_SUFFIX
+        match = _TS_RE.search(os.path.basename(out_path))
+        self.ts = match.group(1) if match else ""
+        self.done = set()       # 이어 쓰기 전에 이미 저널에 있던 (keyword, branch)
+        self.written = 0
+        self._deferred = []     # 오류로 미룬 행: (index, record)
+        self._columns = COLUMNS
+
+        if resume and os.path.exists(self.part_path):
+            self._truncate_partial_line()
+            with open(self.part_path, newline="", encoding="utf-8-sig") as f:
+                reader = csv.DictReader(f)
+                for r in reader:
+                    self.done.add((r["keyword"], r["branch"]))
+                    self.written += 1
+                # 컬럼이 추가되기 전에 시작한 저널은 원래 헤더대로 이어 쓴다
+                self._columns = reader.fieldnames or COLUMNS
+            self._file = open(self.part_path, "a", newline="", encoding="utf-8")
+            self._writer = csv.writer(self._file, lineterminator="\n")
+        else:
+            self._file = open(self.part_path, "w", newline="", encoding="utf-8-sig")
+            self._writer = csv.writer(self._file, lineterminator="\n")
+            self._writer.writerow(COLUMNS)
+            self._file.flush()
+
+    @classmethod
+    def latest_unfinished(cls, pattern="results_*.csv" + PART_SUFFIX):
+        """가장 최근에 중단된 저널을 이어 쓰기로 연다 (없으면 None)"""
+        parts = glob.glob(pattern)
+        if not parts:
+            return None
+        part = max(parts, key=os.path.getmtime)
+        return cls(part[:-len(PART_SUFFIX)], resume=True)
+
+    def _truncate_partial_line(self):
+        """쓰다가 죽어서 줄바꿈 없이 끝난 마지막 행은 버린다"""
+        with open(self.part_path, "rb+") as f:
+            data = f.read()
+            if data and not data.endswith(b"\n"):
+                f.truncate(data.rfind(b"\n") + 1)
+
+    def add(self, index: int, record: dict, ok: bool = True):
+        """index번째 행의 결과 (COLUMNS 키의 dict). ok=False(API 오류)면 finish()까지 미룬다"""
+        if ok:
+            self._write(record)
+            self._file.flush()
+        else:
+            self._deferred.append((index, record))
+
+    def _write(self, rec: dict):
+        self._writer.writerow([rec.get(c, "") for c in self._columns])
+        self.written += 1
+
+    def finish(self, order=None) -> str:
+        """오류로 미룬 행을 붙이고 닫은 뒤 results_{ts}.csv로 바꾼다. 최종 경로를 돌려준다
+
+        order: 키워드 시트의 (keyword, branch) 순서. 주면 저널에 끝난 순서로 쓰인 행을 그 순서로 다시 쓴다.
+        """
+        self._deferred.sort(key=lambda x: x[0])
+        for _, rec in self._deferred:
+            self._write(rec)
+        self._file.close()
+        if order is not None:
+            self._reorder(order)
+        os.replace(self.part_path, self.out_path)
+        return self.out_path
+
+    def _reorder(self, order):
+        """.part의 행을 order 순서로 (시트에 없는 행과 오류로 미룬 행은 원래대로 맨 뒤에)"""
+        slots = {}
+        for pos, key in enumerate(order):
+            slots.setdefault(key, []).append(pos)
+        with open(self.part_path, newline="", encoding="utf-8-sig") as f:
+            reader = csv.reader(f)
+            header = next(reader)
+            kw, br = header.index("keyword"), header.index("branch")
+            body = list(reader)
+        n_ok = len(body) - len(self._deferred)
+        used = {}
+        keys = []
+        for i, row in enumerate(body):
+            # 같은 (keyword, branch)가 시트에 여러 번 있으면 나온 순서대로 자리를 하나씩 배정
+            key = (row[kw], row[br])
+            k = used.get(key, 0)
+            positions = slots.get(key, ())
+            if i < n_ok and k < len(positions):
+                used[key] = k + 1
+                keys.append((0, positions[k]))
+            else:
+                keys.append((1, i))
+        if keys == sorted(keys):
+            return
+        tmp = self.part_path + ".tmp"
+        with open(tmp, "w", newline="", encoding="utf-8-sig") as f:
+            writer = csv.writer(f, lineterminator="\n")
+            writer.writerow(header)
+            writer.writerows(row for _, row in sorted(zip(keys, body), key=lambda x: x[0]))
+        os.replace(tmp, self.part_path)
+
+    def close(self):
+        if not self._file.closed:
+            self._file.close()
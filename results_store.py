@@ -0,0 +1,470 @@
+"""
+순위 결과 저장소 (SQLite, append-only)
+
+main.py가 실행할 때마다 결과를 추가하고, 리포트/대시보드는 여기서 조회한다.
+date(YYYYMMDD) 인덱스가 있어서 기간을 좁힌 조회는 전체 이력 크기와 상관없이 빠르다.
+runs 테이블은 수집 회차(결과 파일) 목록으로, 행을 넣을 때 같이 갱신되므로
+"가장 최근 결과"는 파일들을 훑지 않고 인덱스 한 번으로 찾는다 (load_latest_run).
+daily_ranks 테이블은 (지점, 키워드, 날짜)별 하루 요약으로, 역시 행을 넣을 때 갱신되어
+순위 추이(rank_history)는 원본 이력을 다시 훑지 않고 하루 한 줄씩만 읽는다.
+rank_changes 테이블은 회차마다 직전 회차 대비 순위 변화(rank_changes.py가 계산)를 담는다.
+
+기존 results_*.csv 가져오기 (한 번만):
+    python results_store.py --import
+"""
+
+import argparse
+import csv
+import datetime
+import glob
+import os
+import sqlite3
+from typing import NamedTuple, Optional
+
+STORE_PATH = "results.sqlite3"
+HISTORY_BUCKETS = ("day", "week", "month")
+COLUMNS = ["timestamp", "keyword", "branch", "rank_local",
+           "match_title", "match_link", "match_address", "match_telephone", "check_depth"]
+
+class RankRecord(NamedTuple):
+    """결과 한 행 (순위 없음은 rank=None, depth: 몇 위까지 확인했는지, 기록 전 결과는 None)"""
+    timestamp: str
+    keyword: str
+    branch: str
+    rank: Optional[int]
+    title: str
+    link: str
+    address: str
+    telephone: str
+    depth: Optional[int] = None
+
+class RunInfo(NamedTuple):
+    """수집 회차 하나 (결과 파일 단위)"""
+    id: int
+    source_file: str
+    timestamp: Optional[str]
+    rows: int
+    ranked: int
+
+class RankChange(NamedTuple):
+    """직전 회차 대비 순위 변화 하나
+
+    kind: entered(새로 순위 진입) / dropped(순위 밖으로) / up / down
+    delta: prev_rank - rank (양수면 상승), baseline: 최근 며칠 평균 순위 (없으면 None)
+    """
+    keyword: str
+    branch: str
+    kind: str
+    prev_rank: Optional[int]
+    rank: Optional[int]
+    delta: Optional[int]
+    baseline: Optional[float]
+
+def _to_rank(value):
+    value = str(value if value is not None else "").strip()
+    if not value:
+        return None
+    try:
+        return int(float(value))
+    except ValueError:
+        return None
+
+class ResultsStore:
+    def __init__(self, path=STORE_PATH, check_same_thread=True):
+        self.path = path
+        self.conn = sqlite3.connect(path, check_same_thread=check_same_thread)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS results (
+                id              INTEGER PRIMARY KEY,
+                timestamp       TEXT,
+                date            TEXT,
+                keyword         TEXT,
+                branch          TEXT,
+                rank_local      INTEGER,
+                match_title     TEXT,
+                match_link      TEXT,
+                match_address   TEXT,
+                match_telephone TEXT,
+                source_file     TEXT NOT NULL,
+                check_depth     INTEGER
+            )""")
+        # check_depth(몇 위까지 확인했는지)가 생기기 전에 만든 저장소
+        if "check_depth" not in {row[1] for row in self.conn.execute("PRAGMA table_info(results)")}:
+            self.conn.execute("ALTER TABLE results ADD COLUMN check_depth INTEGER")
+        self.conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_results_date ON results(date)")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_results_source ON results(source_file)")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS runs (
+                id          INTEGER PRIMARY KEY,
+                source_file TEXT NOT NULL UNIQUE,
+                timestamp   TEXT,
+                rows        INTEGER NOT NULL,
+                ranked      INTEGER NOT NULL
+            )""")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_runs_timestamp ON runs(timestamp, id)")
+        # runs 테이블이 생기기 전에 쌓인 결과로 회차 목록을 한 번 채운다
+        if self.conn.execute("SELECT 1 FROM runs LIMIT 1").fetchone() is None:
+            self.conn.execute("""
+                INSERT INTO runs (source_file, timestamp, rows, ranked)
+                SELECT source_file, MIN(timestamp), COUNT(*), COUNT(rank_local)
+                FROM results GROUP BY source_file ORDER BY MIN(id)""")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS daily_ranks (
+                branch    TEXT NOT NULL,
+                keyword   TEXT NOT NULL,
+                date      TEXT NOT NULL,
+                checks    INTEGER NOT NULL,
+                found     INTEGER NOT NULL,
+                rank_min  INTEGER,
+                rank_sum  INTEGER NOT NULL,
+                last_ts   TEXT,
+                rank_last INTEGER,
+                PRIMARY KEY (branch, keyword, date)
+            ) WITHOUT ROWID""")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_daily_ranks_keyword ON daily_ranks(keyword, date)")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS change_runs (
+                run_id      INTEGER PRIMARY KEY,
+                prev_run_id INTEGER
+            )""")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS rank_changes (
+                run_id    INTEGER NOT NULL,
+                keyword   TEXT NOT NULL,
+                branch    TEXT NOT NULL,
+                kind      TEXT NOT NULL,
+                prev_rank INTEGER,
+                rank      INTEGER,
+                delta     INTEGER,
+                baseline  REAL,
+                pos       INTEGER,
+                PRIMARY KEY (run_id, keyword, branch)
+            ) WITHOUT ROWID""")
+        # pos(회차 안의 순서)가 생기기 전에 저장한 변화는 순서를 모르므로 지우고 다음 조회 때 다시 계산한다
+        if "pos" not in {row[1] for row in self.conn.execute("PRAGMA table_info(rank_changes)")}:
+            self.conn.execute("ALTER TABLE rank_changes ADD COLUMN pos INTEGER")
+            self.conn.execute("DELETE FROM rank_changes")
+            self.conn.execute("DELETE FROM change_runs")
+        # daily_ranks 테이블이 생기기 전에 쌓인 결과로 한 번 채운다
+        if self.conn.execute("SELECT 1 FROM daily_ranks LIMIT 1").fetchone() is None:
+            self._update_daily_ranks(0)
+        self.conn.commit()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.conn.close()
+
+    def ensure_legacy_imported(self, pattern="results_*.csv", force=False) -> int:
+        """저장소 도입 전의 results CSV를 처음 한 번만 가져온다 (force면 다시 훑기)"""
+        done = self.conn.execute("SELECT 1 FROM meta WHERE key='legacy_csv_imported'").fetchone()
+        if done and not force:
+            return 0
+        total = import_csv_files(pattern, store=self)
+        with self.conn:
+            self.conn.execute("INSERT OR REPLACE INTO meta VALUES ('legacy_csv_imported', '1')")
+        return total
+
+    def has_source(self, source_file: str) -> bool:
+        return self.conn.execute(
+            "SELECT 1 FROM results WHERE source_file=? LIMIT 1", (source_file,)).fetchone() is not None
+
+    def append_run(self, rows, source_file: str) -> int:
+        """결과 행(dict, results CSV와 같은 컬럼)들을 한 트랜잭션으로 추가"""
+        count = ranked = 0
+        first_ts = None
+
+        def records():
+            # 행을 하나씩 흘려 넣어서 큰 결과 파일도 메모리에 다 올리지 않는다
+            nonlocal count, ranked, first_ts
+            for r in rows:
+                ts = str(r.get("timestamp") or "")
+                rank = _to_rank(r.get("rank_local"))
+                count += 1
+                ranked += rank is not None
+                first_ts = first_ts or ts or None
+                yield (
+                    ts or None, ts[:8] or None,
+                    r.get("keyword"), r.get("branch"), rank,
+                    r.get("match_title"), r.get("match_link"),
+                    r.get("match_address"), r.get("match_telephone"),
+                    source_file, _to_rank(r.get("check_depth")),
+                )
+
+        with self.conn:
+            last_id = self.max_id()
+            self.conn.executemany(
+                "INSERT INTO results (timestamp, date, keyword, branch, rank_local, match_title,"
+                " match_link, match_address, match_telephone, source_file, check_depth)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", records())
+            # 회차 목록도 같은 트랜잭션에서 갱신
+            self.conn.execute(
+                "INSERT INTO runs (source_file, timestamp, rows, ranked) VALUES (?, ?, ?, ?)"
+                " ON CONFLICT(source_file) DO UPDATE SET rows = rows + excluded.rows,"
+                " ranked = ranked + excluded.ranked, timestamp = COALESCE(timestamp, excluded.timestamp)",
+                (source_file, first_ts, count, ranked))
+            self._update_daily_ranks(last_id)
+        return count
+
+    def _update_daily_ranks(self, after_id: int):
+        """id > after_id인 새 결과를 (지점, 키워드, 날짜)별 하루 요약에 더한다"""
+        self.conn.execute("""
+            INSERT INTO daily_ranks (branch, keyword, date, checks, found, rank_min, rank_sum, last_ts, rank_last)
+            SELECT g.branch, g.keyword, g.date, g.checks, g.found, g.rank_min, g.rank_sum,
+                   r.timestamp, r.rank_local
+            FROM (SELECT branch, keyword, date, COUNT(*) AS checks, COUNT(rank_local) AS found,
+                         MIN(rank_local) AS rank_min, COALESCE(SUM(rank_local), 0) AS rank_sum,
+                         MAX(id) AS last_id
+                  FROM results
+                  WHERE id > ? AND date IS NOT NULL AND branch IS NOT NULL AND keyword IS NOT NULL
+                  GROUP BY branch, keyword, date) AS g
+            JOIN results AS r ON r.id = g.last_id
+            WHERE true
+            ON CONFLICT (branch, keyword, date) DO UPDATE SET
+                checks = checks + excluded.checks,
+                found = found + excluded.found,
+                rank_min = COALESCE(MIN(rank_min, excluded.rank_min), rank_min, excluded.rank_min),
+                rank_sum = rank_sum + excluded.rank_sum,
+                rank_last = CASE WHEN COALESCE(excluded.last_ts, '') >= COALESCE(last_ts, '')
+                                 THEN excluded.rank_last ELSE rank_last END,
+                last_ts = MAX(COALESCE(last_ts, ''), COALESCE(excluded.last_ts, ''))""",
+            (after_id,))
+
+    def import_csv(self, path: str) -> int:
+        """results CSV 하나를 가져온다. 이미 가져온 파일이면 0"""
+        source_file = os.path.basename(path)
+        if self.has_source(source_file):
+            return 0
+        with open(path, newline="", encoding="utf-8-sig") as f:
+            return self.append_run(csv.DictReader(f), source_file)
+
+    def latest_run(self) -> Optional[RunInfo]:
+        """가장 최근 수집 회차 (timestamp 순, 같으면 늦게 들어온 것). 없으면 None"""
+        row = self.conn.execute(
+            "SELECT id, source_file, timestamp, rows, ranked FROM runs"
+            " ORDER BY timestamp DESC, id DESC LIMIT 1").fetchone()
+        return RunInfo._make(row) if row else None
+
+    def run_info(self, source_file: str) -> Optional[RunInfo]:
+        """결과 파일 이름으로 회차 찾기 (없으면 None)"""
+        row = self.conn.execute(
+            "SELECT id, source_file, timestamp, rows, ranked FROM runs WHERE source_file=?",
+            (source_file,)).fetchone()
+        return RunInfo._make(row) if row else None
+
+    def previous_run(self, run: RunInfo) -> Optional[RunInfo]:
+        """run 바로 앞의 수집 회차 (없으면 None)"""
+        row = self.conn.execute(
+            "SELECT id, source_file, timestamp, rows, ranked FROM runs"
+            " WHERE timestamp < ? OR (timestamp = ? AND id < ?)"
+            " ORDER BY timestamp DESC, id DESC LIMIT 1", (run.timestamp, run.timestamp, run.id)).fetchone()
+        return RunInfo._make(row) if row else None
+
+    def daily_rank_mean(self, branch: str, keyword: str, since: str, until: str) -> Optional[float]:
+        """(지점, 키워드)의 since <= date < until 평균 순위 (daily_ranks 기본키로 바로 찾음)"""
+        total, found = self.conn.execute(
+            "SELECT SUM(rank_sum), SUM(found) FROM daily_ranks"
+            " WHERE branch=? AND keyword=? AND date >= ? AND date < ?",
+            (branch, keyword, since, until)).fetchone()
+        return round(total / found, 2) if found else None
+
+    def save_changes(self, run_id: int, prev_run_id: Optional[int], changes) -> None:
+        """회차 하나의 순위 변화를 저장 (다시 계산하면 덮어쓴다). 목록 순서는 pos로 남는다"""
+        with self.conn:
+            self.conn.execute("DELETE FROM rank_changes WHERE run_id=?", (run_id,))
+            self.conn.executemany(
+                "INSERT INTO rank_changes VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                ((run_id,) + tuple(c) + (pos,) for pos, c in enumerate(changes)))
+            self.conn.execute("INSERT OR REPLACE INTO change_runs VALUES (?, ?)", (run_id, prev_run_id))
+
+    def run_changes(self, run_id: int) -> Optional[list]:
+        """저장된 순위 변화 (RankChange 목록, 저장한 순서). 아직 계산하지 않은 회차면 None"""
+        if self.conn.execute("SELECT 1 FROM change_runs WHERE run_id=?", (run_id,)).fetchone() is None:
+            return None
+        cur = self.conn.execute(
+            "SELECT keyword, branch, kind, prev_rank, rank, delta, baseline FROM rank_changes"
+            " WHERE run_id=? ORDER BY pos", (run_id,))
+        return [RankChange._make(row) for row in cur]
+
+    def runs(self, since: str = None, until: str = None) -> list:
+        """기간(YYYYMMDD, 양끝 포함)의 수집 회차들 (RunInfo, 오래된 순)"""
+        where, params = [], []
+        if since:
+            where.append("substr(timestamp, 1, 8) >= ?")
+            params.append(since)
+        if until:
+            where.append("substr(timestamp, 1, 8) <= ?")
+            params.append(until)
+        sql = "SELECT id, source_file, timestamp, rows, ranked FROM runs"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY timestamp, id"
+        return [RunInfo._make(row) for row in self.conn.execute(sql, params)]
+
+    def iter_records(self, source_file: str):
+        """회차 하나의 결과 행들을 커서에서 바로 하나씩 (RankRecord, 파일에 적힌 순서)"""
+        cur = self.conn.execute(
+            "SELECT timestamp, keyword, branch, rank_local, match_title, match_link,"
+            " match_address, match_telephone, check_depth FROM results WHERE source_file=? ORDER BY id",
+            (source_file,))
+        for ts, kw, br, rank, t, l, a, tel, depth in cur:
+            yield RankRecord(ts or "", kw or "", br or "", rank, t or "", l or "", a or "", tel or "", depth)
+
+    def run_records(self, source_file: str) -> list:
+        """회차 하나의 결과 행들 (RankRecord, 파일에 적힌 순서)"""
+        return list(self.iter_records(source_file))
+
+    def rank_history(self, branch: str = None, keyword: str = None, since: str = None,
+                     until: str = None, bucket: str = "day") -> list:
+        """(지점, 키워드)별 순위 추이. bucket(day/week/month)마다 checks/found와 순위 min/mean/last
+
+        기간은 YYYYMMDD(양끝 포함). 하루 요약(daily_ranks)만 읽으므로 1년치도 시리즈당 365행.
+        반환: [{"branch", "keyword", "points": [{"date": "YYYY-MM-DD", ...}, ...]}, ...]
+        """
+        if bucket not in HISTORY_BUCKETS:
+            raise ValueError(f"bucket은 {', '.join(HISTORY_BUCKETS)} 중 하나여야 합니다: {bucket}")
+        where, params = [], []
+        for column, value, op in (("branch", branch, "="), ("keyword", keyword, "="),
+                                  ("date", since, ">="), ("date", until, "<=")):
+            if value:
+                where.append(f"{column} {op} ?")
+                params.append(value)
+        sql = "SELECT branch, keyword, date, checks, found, rank_min, rank_sum, rank_last FROM daily_ranks"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY branch, keyword, date"
+
+        series = []
+        current = point = None
+        for br, kw, date, checks, found, rank_min, rank_sum, rank_last in self.conn.execute(sql, params):
+            if current is None or current["branch"] != br or current["keyword"] != kw:
+                current = {"branch": br, "keyword": kw, "points": []}
+                series.append(current)
+                point = None
+            key = _bucket_start(date, bucket)
+            if point is None or point["date"] != key:
+                point = {"date": key, "checks": 0, "found": 0, "min": None, "sum": 0, "last": None}
+                current["points"].append(point)
+            point["checks"] += checks
+            point["found"] += found
+            if rank_min is not None and (point["min"] is None or rank_min < point["min"]):
+                point["min"] = rank_min
+            point["sum"] += rank_sum
+            point["last"] = rank_last
+        for item in series:
+            for p in item["points"]:
+                _finish_point(p)
+        return series
+
+    def max_id(self) -> int:
+        return self.conn.execute("SELECT COALESCE(MAX(id), 0) FROM results").fetchone()[0]
+
+    @staticmethod
+    def _result_filter(since=None, until=None, after_id=None, upto_id=None, undated=False):
+        """results WHERE 절과 파라미터 (기간은 YYYYMMDD 양끝 포함, undated면 날짜 없는 행만)"""
+        where, params = [], []
+        if after_id:
+            where.append("id > ?")
+            params.append(after_id)
+        if upto_id is not None:
+            where.append("id <= ?")
+            params.append(upto_id)
+        if since:
+            where.append("date >= ?")
+            params.append(since)
+        if until:
+            where.append("date <= ?")
+            params.append(until)
+        if undated:
+            where.append("date IS NULL")
+        return (" WHERE " + " AND ".join(where) if where else ""), params
+
+    def read_frame(self, since: str = None, until: str = None, after_id: int = None, upto_id: int = None):
+        """기간(YYYYMMDD, 양끝 포함)이나 id 구간(after_id < id <= upto_id)의 결과를 DataFrame으로 (pandas 필요)"""
+        import pandas as pd
+        where, params = self._result_filter(since, until, after_id, upto_id)
+        sql = f"SELECT {', '.join(COLUMNS)}, source_file FROM results{where} ORDER BY id"
+        return pd.read_sql_query(sql, self.conn, params=params)
+
+    def iter_rows(self, since: str = None, until: str = None, undated: bool = False):
+        """read_frame과 같은 행을 DataFrame 없이 튜플(COLUMNS + source_file)로 하나씩 (큰 이력 내보내기용)"""
+        where, params = self._result_filter(since, until, undated=undated)
+        return self.conn.execute(f"SELECT {', '.join(COLUMNS)}, source_file FROM results{where} ORDER BY id", params)
+
+    def count_rows(self, since: str = None, until: str = None) -> int:
+        where, params = self._result_filter(since, until)
+        return self.conn.execute(f"SELECT COUNT(*) FROM results{where}", params).fetchone()[0]
+
+    def months(self, since: str = None, until: str = None) -> list:
+        """결과가 있는 달(YYYYMM) 목록. 날짜 없는 행이 있으면 None도 들어간다 (맨 앞)"""
+        where, params = self._result_filter(since, until)
+        cur = self.conn.execute(f"SELECT DISTINCT substr(date, 1, 6) FROM results{where} ORDER BY 1", params)
+        return [row[0] for row in cur]
+
+def _bucket_start(date: str, bucket: str) -> str:
+    """YYYYMMDD → 그 날짜가 속한 구간의 첫날 (YYYY-MM-DD, 주는 월요일 시작)"""
+    day = datetime.date(int(date[:4]), int(date[4:6]), int(date[6:8]))
+    if bucket == "week":
+        day -= datetime.timedelta(days=day.weekday())
+    elif bucket == "month":
+        day = day.replace(day=1)
+    return day.isoformat()
+
+def _finish_point(point: dict):
+    """합계로 들고 있던 순위를 평균으로 바꾼다"""
+    total = point.pop("sum")
+    point["mean"] = round(total / point["found"], 2) if point["found"] else None
+
+def load_latest_run(path=STORE_PATH, legacy_pattern="results_*.csv"):
+    """가장 최근 회차와 그 결과 행들 (RunInfo, [RankRecord]). 결과가 없으면 (None, [])
+
+    대시보드/요약 스크립트들이 공통으로 쓴다. 저장소 도입 전 CSV는 처음 한 번만 가져온다.
+    """
+    with ResultsStore(path) as store:
+        store.ensure_legacy_imported(legacy_pattern)
+        run = store.latest_run()
+        if run is None:
+            return None, []
+        return run, store.run_records(run.source_file)
+
+def import_csv_files(pattern="results_*.csv", store: ResultsStore = None) -> int:
+    """아직 가져오지 않은 results CSV를 모두 저장소에 넣는다"""
+    own = store is None
+    store = store or ResultsStore()
+    total = 0
+    try:
+        for path in sorted(glob.glob(pattern)):
+            try:
+                n = store.import_csv(path)
+            except Exception as e:
+                print(f"[WARN] {path}: {e}")
+                continue
+            if n:
+                print(f"가져옴: {path} ({n}행)")
+            total += n
+    finally:
+        if own:
+            store.close()
+    return total
+
+def main():
+    ap = argparse.ArgumentParser(description="순위 결과 저장소")
+    ap.add_argument("--import", dest="import_pattern", nargs="?", const="results_*.csv",
+                    help="기존 results CSV 가져오기 (기본 패턴: results_*.csv)")
+    args = ap.parse_args()
+
+    if args.import_pattern:
+        with ResultsStore() as store:
+            total = store.ensure_legacy_imported(args.import_pattern, force=True)
+        print(f"가져오기 완료: {total}행 → {STORE_PATH}")
+    else:
+        ap.print_help()
+
+if __name__ == "__main__":
+    main()
@@ -1,41 +1,32 @@
-import csv
-import glob
-import os
+from results_store import load_latest_run
 
 def show_latest_ranks():
-    # 가장 최신 results 파일 찾기
-    result_files = glob.glob("results_*.csv")
-    if not result_files:
+    # 가장 최신 수집 결과 (결과 저장소의 회차 목록에서 바로 찾음)
+    run, records = load_latest_run()
+    if run is None:
         print("결과 파일을 찾을 수 없습니다.")
         print("먼저 메뉴 4번 '새로운 순위 데이터 수집'을 실행해주세요.")
         print("그러면 순위 데이터가 수집되어 결과 파일이 생성됩니다.")
         return
     
-    latest_file = max(result_files, key=os.path.getctime)
-    print(f"최신 결과 파일: {latest_file}")
+    print(f"최신 결과 파일: {run.source_file}")
     print("=" * 50)
     
     # 순위가 있는 지점과 없는 지점 분리
     ranked_branches = []
     no_rank_branches = []
     
-    with open(latest_file, 'r', encoding='utf-8-sig') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            branch = row['branch']
-            rank = row['rank_local'].strip()
-            keyword = row['keyword']
-            
-            if rank and rank != '':
-                ranked_branches.append((branch, rank, keyword))
-            else:
-                no_rank_branches.append((branch, keyword))
+    for r in records:
+        if r.rank is not None:
+            ranked_branches.append((r.branch, r.rank, r.keyword))
+        else:
+            no_rank_branches.append((r.branch, r.keyword))
     
     # 순위가 있는 지점들 (순위순으로 정렬)
     if ranked_branches:
         print("순위 발견된 지점들:")
         print("-" * 30)
-        ranked_branches.sort(key=lambda x: int(x[1]))
+        ranked_branches.sort(key=lambda x: x[1])
         for branch, rank, keyword in ranked_branches:
             print(f"  {branch}: {rank}위 ({keyword})")
         print()
@@ -3,86 +3,85 @@
 간단한 웹서버 - API 엔드포인트 포함
 """
 
-import http.server
-import socketserver
 import json
-import csv
-import glob
-import os
-from datetime import datetime
+import threading
 from urllib.parse import urlparse
+from create_dashboard import build_payload, build_history
+from results_store import ResultsStore, STORE_PATH
+from rank_changes import run_changes
+from web_common import PooledHTTPServer, PooledRequestHandler, CachedBody, SERVER_WORKERS
+
+class ResultsCache:
+    """/api/data 응답을 JSON 바이트(+ETag, gzip)로 메모리에 들고 있다가, 저장소에 새 회차가 들어올 때만 다시 만든다.
+
+    평소 요청은 저장소의 최신 회차(runs 인덱스)를 한 번 조회하는 것으로 끝난다.
+    """
+    def __init__(self, store_path=STORE_PATH):
+        self.store_path = store_path
+        self.body = None
+        self._store = None
+        self._signature = None
+        self._lock = threading.Lock()
+
+    def get(self) -> CachedBody:
+        with self._lock:
+            try:
+                if self._store is None:
+                    self._store = ResultsStore(self.store_path, check_same_thread=False)
+                    self._store.ensure_legacy_imported()
+                run = self._store.latest_run()
+            except Exception as e:
+                return self._error_body(f"데이터 로드 실패: {str(e)}")
+            if self.body is None or run != self._signature:
+                self._rebuild(run)
+                self._signature = run
+            return self.body
+
+    def _rebuild(self, run):
+        try:
+            if run is None:
+                response_data = {"error": "결과 파일을 찾을 수 없습니다."}
+            else:
+                response_data = build_payload(run, self._store.run_records(run.source_file),
+                                              run_changes(self._store, run))
+        except Exception as e:
+            response_data = {"error": f"데이터 로드 실패: {str(e)}"}
+        self.body = CachedBody(json.dumps(response_data, ensure_ascii=False).encode('utf-8'))
+
+    def _error_body(self, message):
+        return CachedBody(json.dumps({"error": message}, ensure_ascii=False).encode('utf-8'))
+
+class CustomHTTPRequestHandler(PooledRequestHandler):
+    results_cache = ResultsCache()
 
-class CustomHTTPRequestHandler(http.server.SimpleHTTPRequestHandler):
     def do_GET(self):
         parsed_path = urlparse(self.path)
         path = parsed_path.path
         
-        # API 엔드포인트 처리
+        # API 엔드포인트 처리 (메모리에 들고 있는 JSON 바이트를 그대로 전송, 안 바뀌었으면 304)
         if path == '/api/data':
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.send_header('Access-Control-Allow-Origin', '*')
-            self.end_headers()
-            
+            self.send_cached(self.results_cache.get(), 'application/json')
+            return
+        
+        # 순위 추이 (지점/키워드별, day/week/month 단위로 줄여서)
+        if path == '/api/history':
             try:
-                # 최신 데이터 로드
-                result_files = glob.glob("results_*.csv")
-                if not result_files:
-                    response_data = {"error": "결과 파일을 찾을 수 없습니다."}
-                else:
-                    latest_file = max(result_files, key=os.path.getctime)
-                    
-                    ranks_data = []
-                    with open(latest_file, 'r', encoding='utf-8-sig') as f:
-                        reader = csv.DictReader(f)
-                        for row in reader:
-                            rank = row['rank_local'].strip()
-                            ranks_data.append({
-                                'branch': row['branch'],
-                                'keyword': row['keyword'],
-                                'rank': int(rank) if rank and rank.isdigit() else None,
-                                'title': row.get('match_title', ''),
-                                'address': row.get('match_address', ''),
-                                'link': row.get('match_link', ''),
-                                'telephone': row.get('match_telephone', '')
-                            })
-                    
-                    # 통계 계산
-                    total_branches = len(ranks_data)
-                    ranked_branches = [r for r in ranks_data if r['rank'] is not None]
-                    top5_branches = [r for r in ranked_branches if r['rank'] <= 5]
-                    
-                    response_data = {
-                        'data': ranks_data,
-                        'stats': {
-                            'total_branches': total_branches,
-                            'ranked_branches': len(ranked_branches),
-                            'top5_branches': len(top5_branches),
-                            'rank_rate': len(ranked_branches)/total_branches*100 if total_branches > 0 else 0
-                        },
-                        'last_update': datetime.now().strftime('%Y년 %m월 %d일 %H:%M'),
-                        'file_name': latest_file
-                    }
-                
-                self.wfile.write(json.dumps(response_data, ensure_ascii=False).encode('utf-8'))
-                return
-                
-            except Exception as e:
-                error_response = {"error": f"데이터 로드 실패: {str(e)}"}
-                self.wfile.write(json.dumps(error_response, ensure_ascii=False).encode('utf-8'))
-                return
+                self.send_json(build_history(parsed_path.query))
+            except ValueError as e:
+                self.send_json({"error": str(e)}, 400)
+            return
         
         # 기본 파일 서빙
         super().do_GET()
 
-def main():
-    port = 8000
+def main(port=8000, workers=SERVER_WORKERS):
     print(f"웹서버 시작: http://localhost:{port}")
     print(f"대시보드: http://localhost:{port}/dashboard.html")
-    print(f"API: http://localhost:{port}/api/data")
+    print(f"API: http://localhost:{port}/api/data, /api/history?branch=&keyword=&from=&to=&bucket=day")
+    print(f"동시 처리: 최대 {workers}개 연결")
     print("종료: Ctrl+C")
     
-    with socketserver.TCPServer(("", port), CustomHTTPRequestHandler) as httpd:
+    with PooledHTTPServer(("", port), CustomHTTPRequestHandler, workers) as httpd:
         try:
             httpd.serve_forever()
         except KeyboardInterrupt:
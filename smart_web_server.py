@@ -3,27 +3,42 @@
 스마트 웹서버 - 대시보드 자동 업데이트 + 웹서버
 """
 
-import http.server
-import socketserver
+import argparse
 import webbrowser
 import threading
 import time
-import os
-import subprocess
 import socket
 import json
-import csv
-import glob
 from datetime import datetime
 from urllib.parse import urlparse, parse_qs
+from create_dashboard import build_payload, build_history, update_dashboard
+from results_store import ResultsStore
+from rank_changes import load_latest_changes
+from web_common import PooledHTTPServer, PooledRequestHandler, CachedBody, EventBroadcaster, SERVER_WORKERS
+
+UPDATE_INTERVAL_SEC = 600   # 대시보드 전체 재생성 주기
+WATCH_INTERVAL_SEC = 1      # 저장소에 새 수집 결과가 들어왔는지 확인하는 주기
+COLLECT_INTERVAL_SEC = 600  # 순위 자동 수집 주기 (0이면 수집하지 않음)
+COLLECT_ARGS = ["--async"]  # 자동 수집 때 main.py에 넘길 옵션
+FRESH_ARGS = ["--max-age", "0"]  # 자동 수집은 항상 새로 조회 (응답 캐시 유효 시간이 수집 주기와 같아서 지난 회차 페이지를 다시 쓰게 됨)
 
 class SmartWebServer:
-    def __init__(self, port=8000):
+    def __init__(self, port=8000, workers=SERVER_WORKERS,
+                 collect_interval=COLLECT_INTERVAL_SEC, collect_args=COLLECT_ARGS):
         self.port = port
+        self.workers = workers
+        self.collect_interval = collect_interval
+        self.collect_args = list(collect_args)
+        self._collect_lock = threading.Lock()   # 수집은 한 번에 하나만
+        self._refresh_lock = threading.Lock()
         self.server = None
         self.running = False
         self.latest_data = None
+        self.latest_body = None
         self.last_update = None
+        self.data_signature = None
+        # SSE 스트림은 작업자 하나를 계속 잡으므로 절반까지만 허용 (나머지는 일반 요청용)
+        self.broadcaster = EventBroadcaster(max_clients=max(1, workers // 2))
         
     def get_local_ip(self):
         """로컬 IP 주소 가져오기"""
@@ -40,78 +55,121 @@ class SmartWebServer:
     def load_latest_data(self):
         """최신 데이터 로드"""
         try:
-            result_files = glob.glob("results_*.csv")
-            if not result_files:
+            run, records, changes = load_latest_changes()
+            if run is None:
                 return None
-            
-            latest_file = max(result_files, key=os.path.getctime)
-            
-            ranks_data = []
-            with open(latest_file, 'r', encoding='utf-8-sig') as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    rank = row['rank_local'].strip()
-                    ranks_data.append({
-                        'branch': row['branch'],
-                        'keyword': row['keyword'],
-                        'rank': int(rank) if rank and rank.isdigit() else None,
-                        'title': row.get('match_title', ''),
-                        'address': row.get('match_address', ''),
-                        'link': row.get('match_link', ''),
-                        'telephone': row.get('match_telephone', '')
-                    })
-            
-            # 통계 계산
-            total_branches = len(ranks_data)
-            ranked_branches = [r for r in ranks_data if r['rank'] is not None]
-            top5_branches = [r for r in ranked_branches if r['rank'] <= 5]
-            
-            return {
-                'data': ranks_data,
-                'stats': {
-                    'total_branches': total_branches,
-                    'ranked_branches': len(ranked_branches),
-                    'top5_branches': len(top5_branches),
-                    'rank_rate': len(ranked_branches)/total_branches*100 if total_branches > 0 else 0
-                },
-                'last_update': datetime.now().strftime('%Y년 %m월 %d일 %H:%M'),
-                'file_name': latest_file
-            }
+            return build_payload(run, records, changes)
         except Exception as e:
             print(f"데이터 로드 실패: {e}")
             return None
 
-    def auto_update_dashboard(self):
-        """10분마다 대시보드 자동 업데이트"""
-        while self.running:
+    def results_signature(self):
+        """저장소의 최신 회차(RunInfo). 새 수집 결과가 들어오면 바뀐다 (인덱스 조회 한 번)"""
+        try:
+            with ResultsStore() as store:
+                return store.latest_run()
+        except Exception:
+            return None
+
+    def set_latest_data(self, data):
+        """/api/data로 내보낼 데이터를 교체하고, 응답 바이트(ETag/gzip)도 미리 만들어 둔다.
+        순위 내용이 실제로 바뀌었을 때만 SSE 구독자에게 'ranks' 이벤트를 보낸다"""
+        self.latest_data = data
+        if data is None:
+            data = {"error": "데이터를 찾을 수 없습니다."}
+        body = json.dumps(data, ensure_ascii=False).encode('utf-8')
+        self.latest_body = CachedBody(body)
+        self.last_update = datetime.now()
+
+        signature = json.dumps([data.get('file_name'), data.get('data'), data.get('error')],
+                               ensure_ascii=False)
+        if signature != self.data_signature:
+            self.data_signature = signature
+            self.broadcaster.publish('ranks', body)
+
+    def refresh_dashboard(self):
+        """결과를 한 번 읽어서 dashboard.html과 /api/data를 같이 갱신 (바뀌었으면 브라우저로 푸시)"""
+        with self._refresh_lock:
             try:
                 print(f"[{datetime.now().strftime('%H:%M:%S')}] 🔄 대시보드 업데이트 중...")
-                subprocess.run(["python", "create_dashboard.py"], 
-                             capture_output=True, text=True)
-                
-                # 최신 데이터 로드
-                self.latest_data = self.load_latest_data()
-                self.last_update = datetime.now()
-                
-                print(f"[{datetime.now().strftime('%H:%M:%S')}] ✅ 대시보드 업데이트 완료")
+                t0 = time.perf_counter()
+                self.set_latest_data(update_dashboard())
+                elapsed_ms = (time.perf_counter() - t0) * 1000
+                print(f"[{datetime.now().strftime('%H:%M:%S')}] ✅ 대시보드 업데이트 완료 ({elapsed_ms:.0f}ms)")
             except Exception as e:
                 print(f"[{datetime.now().strftime('%H:%M:%S')}] ❌ 업데이트 실패: {e}")
+
+    def auto_update_dashboard(self):
+        """10분마다, 또는 저장소에 새 수집 결과가 들어오면 바로 대시보드 업데이트"""
+        signature = self.results_signature()
+        while self.running:
+            self.refresh_dashboard()
             
-            # 10분 대기 (600초)
-            for _ in range(600):
-                if not self.running:
+            # 10분 대기. 그 사이 새 수집 결과가 생기면 바로 다시 업데이트
+            waited = 0
+            while self.running and waited < UPDATE_INTERVAL_SEC:
+                time.sleep(WATCH_INTERVAL_SEC)
+                waited += WATCH_INTERVAL_SEC
+                current = self.results_signature()
+                if current != signature:
+                    signature = current
                     break
-                time.sleep(1)
+
+    def collect_once(self) -> bool:
+        """순위 수집(main.main)을 한 번 돌리고 결과를 바로 대시보드에 반영.
+        이전 수집이 아직 돌고 있으면 기다리지 않고 건너뛴다 (False)"""
+        if not self._collect_lock.acquire(blocking=False):
+            print(f"[{datetime.now().strftime('%H:%M:%S')}] ⏭️ 이전 수집이 아직 진행 중이라 이번 수집은 건너뜁니다")
+            return False
+        try:
+            print(f"[{datetime.now().strftime('%H:%M:%S')}] 📡 순위 수집 시작 (main.py {' '.join(self.collect_args)})")
+            t0 = time.perf_counter()
+            import main as collector    # pandas 등 무거운 import는 처음 수집할 때만
+            args = list(self.collect_args)
+            if "--max-age" not in args and "--no-cache" not in args:
+                args += FRESH_ARGS
+            out_path = collector.main(args)
+            print(f"[{datetime.now().strftime('%H:%M:%S')}] ✅ 순위 수집 완료 → {out_path} ({time.perf_counter() - t0:.1f}초)")
+            self.refresh_dashboard()
+            return True
+        except (Exception, SystemExit) as e:
+            print(f"[{datetime.now().strftime('%H:%M:%S')}] ❌ 순위 수집 실패: {e}")
+            return False
+        finally:
+            self._collect_lock.release()
+
+    def auto_collect(self):
+        """collect_interval마다 백그라운드 작업자 스레드에서 순위 수집.
+        시각이 됐는데 이전 수집이 안 끝났으면 그 회차는 건너뛰고, 밀린 회차를 몰아서 돌리지 않는다"""
+        from naver_client import CID, CSECRET
+        if not CID or not CSECRET:
+            print("⚠️ NAVER_CLIENT_ID / NAVER_CLIENT_SECRET이 없어 자동 수집을 하지 않습니다 (기존 결과만 표시)")
+            return
+
+        # 마지막 수집이 주기보다 오래됐으면 바로, 아니면 남은 시간만큼 기다렸다가 첫 수집
+        latest = self.results_signature()
+        try:
+            last_collected = datetime.strptime(latest.timestamp, "%Y%m%d_%H%M").timestamp()
+        except (AttributeError, TypeError, ValueError):
+            last_collected = 0
+        next_run = max(time.time(), last_collected + self.collect_interval)
+        while self.running:
+            if time.time() >= next_run:
+                worker = threading.Thread(target=self.collect_once, name="collect", daemon=True)
+                worker.start()
+                next_run += self.collect_interval
+                if next_run <= time.time():
+                    next_run = time.time() + self.collect_interval
+            time.sleep(WATCH_INTERVAL_SEC)
     
     def start_server(self):
         """웹서버 시작"""
         try:
             # 초기 데이터 로드
-            self.latest_data = self.load_latest_data()
-            self.last_update = datetime.now()
+            self.set_latest_data(self.load_latest_data())
             
             # 커스텀 핸들러 클래스 정의
-            class CustomHTTPRequestHandler(http.server.SimpleHTTPRequestHandler):
+            class CustomHTTPRequestHandler(PooledRequestHandler):
                 def __init__(self, *args, **kwargs):
                     self.server_instance = None
                     super().__init__(*args, **kwargs)
@@ -122,19 +180,21 @@ class SmartWebServer:
                     
                     # API 엔드포인트 처리
                     if path == '/api/data':
-                        self.send_response(200)
-                        self.send_header('Content-type', 'application/json')
-                        self.send_header('Access-Control-Allow-Origin', '*')
-                        self.end_headers()
-                        
-                        # 서버 인스턴스에서 데이터 가져오기
-                        server_instance = self.server.server_instance
-                        if server_instance and server_instance.latest_data:
-                            response_data = server_instance.latest_data
-                        else:
-                            response_data = {"error": "데이터를 찾을 수 없습니다."}
-                        
-                        self.wfile.write(json.dumps(response_data, ensure_ascii=False).encode('utf-8'))
+                        # 서버 인스턴스가 미리 만들어 둔 응답 바이트 (안 바뀌었으면 304)
+                        self.send_cached(self.server.server_instance.latest_body, 'application/json')
+                        return
+                    
+                    # 순위 추이 (지점/키워드별, day/week/month 단위로 줄여서)
+                    if path == '/api/history':
+                        try:
+                            self.send_json(build_history(parsed_path.query))
+                        except ValueError as e:
+                            self.send_json({"error": str(e)}, 400)
+                        return
+                    
+                    # 새 데이터 푸시 (Server-Sent Events)
+                    if path == '/api/stream':
+                        self.send_event_stream(self.server.server_instance.broadcaster)
                         return
                     
                     # 기본 파일 서빙
@@ -144,7 +204,8 @@ class SmartWebServer:
             CustomHTTPRequestHandler.server_instance = self
             
             # 웹서버 설정
-            self.server = socketserver.TCPServer(("", self.port), CustomHTTPRequestHandler)
+            self.server = PooledHTTPServer(("", self.port), CustomHTTPRequestHandler, self.workers)
+            self.server.server_instance = self
             
             local_ip = self.get_local_ip()
             
@@ -161,9 +222,13 @@ class SmartWebServer:
             print(f"   3. 실시간 대시보드 확인!")
             print()
             print(f"🔄 자동 기능:")
-            print(f"   - 10분마다 데이터 자동 수집")
+            if self.collect_interval > 0:
+                print(f"   - {self.collect_interval / 60:g}분마다 데이터 자동 수집 (이전 수집이 진행 중이면 건너뜀)")
+            else:
+                print(f"   - 자동 수집 꺼짐 (main.py로 새로 수집하면 바로 반영)")
             print(f"   - 대시보드 자동 업데이트")
-            print(f"   - 브라우저 자동 새로고침")
+            print(f"   - 새 데이터는 열린 브라우저로 바로 전송 (/api/stream)")
+            print(f"   - 동시 접속 최대 {self.workers}개 연결 처리 (실시간 스트림 {self.broadcaster.max_clients}개)")
             print()
             print(f"🚨 종료: Ctrl+C 누르기")
             print("=" * 60)
@@ -175,6 +240,12 @@ class SmartWebServer:
             update_thread.daemon = True
             update_thread.start()
             
+            # 자동 수집 스케줄러 시작 (수집은 별도 작업자 스레드에서 돌아서 웹서버를 막지 않는다)
+            if self.collect_interval > 0:
+                collect_thread = threading.Thread(target=self.auto_collect, name="collect-scheduler")
+                collect_thread.daemon = True
+                collect_thread.start()
+            
             # 브라우저 자동 열기
             webbrowser.open(f"http://localhost:{self.port}")
             
@@ -190,18 +261,27 @@ class SmartWebServer:
         """웹서버 중단"""
         print("\n웹서버를 중단합니다...")
         self.running = False
+        self.broadcaster.close()
         if self.server:
             self.server.shutdown()
             self.server.server_close()
         print("웹서버가 중단되었습니다.")
 
-def main():
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="스마트 웹서버 (대시보드 + 자동 수집)")
+    ap.add_argument("--collect-interval", type=float, default=COLLECT_INTERVAL_SEC,
+                    help=f"순위 자동 수집 주기(초), 0이면 수집하지 않음 (기본 {COLLECT_INTERVAL_SEC})")
+    ap.add_argument("--collect-args", default=" ".join(COLLECT_ARGS),
+                    help=f"자동 수집 때 main.py에 넘길 옵션 (기본 '{' '.join(COLLECT_ARGS)}')")
+    args = ap.parse_args(argv)
+    
     print("스마트 웹서버를 시작합니다...")
     
     # 포트 설정 (8000이 사용 중이면 8001, 8002... 시도)
     for port in range(8000, 8010):
         try:
-            server = SmartWebServer(port)
+            server = SmartWebServer(port, collect_interval=args.collect_interval,
+                                    collect_args=args.collect_args.split())
             server.start_server()
             break
         except OSError as e:
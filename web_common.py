@@ -0,0 +1,245 @@
+"""
+대시보드 웹서버 공통 부품 (simple_server.py, smart_web_server.py)
+
+- PooledHTTPServer: 고정 크기 스레드 풀로 요청을 동시에 처리
+- PooledRequestHandler: HTTP/1.1 keep-alive, 풀이 밀려 있으면 응답 후 연결을 닫아 자리 양보
+- CachedBody: 응답 바이트 + ETag + gzip 압축본 (If-None-Match면 304)
+- EventBroadcaster: Server-Sent Events(/api/stream)로 새 데이터를 브라우저에 밀어주기
+"""
+
+import gzip
+import hashlib
+import http.server
+import json
+import os
+import socketserver
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+SERVER_WORKERS = 32        # 동시에 처리할 연결 수
+KEEPALIVE_TIMEOUT = 5      # 요청 없이 열어둘 keep-alive 연결 유지 시간(초)
+REQUEST_QUEUE_SIZE = 256   # accept 대기열
+
+GZIP_MIN_SIZE = 1024       # 이보다 작은 응답은 압축하지 않음
+CACHED_STATIC_EXT = (".html", ".css", ".js", ".json")   # ETag/gzip으로 내보낼 정적 파일
+
+STREAM_HEARTBEAT_SEC = 15  # 이벤트가 없을 때 SSE 연결 유지용 주석을 보내는 간격(초)
+STREAM_RETRY_MS = 3000     # 끊겼을 때 브라우저가 다시 붙기까지 기다릴 시간
+
+class CachedBody:
+    """한 번 만든 응답 바이트와 그 ETag(내용 해시), gzip 압축본"""
+    __slots__ = ("body", "etag", "gzipped")
+
+    def __init__(self, body: bytes):
+        self.body = body
+        self.etag = '"%s"' % hashlib.sha1(body).hexdigest()
+        self.gzipped = gzip.compress(body, 6) if len(body) >= GZIP_MIN_SIZE else None
+
+class StaticFileCache:
+    """정적 파일을 (mtime, 크기)가 바뀔 때만 다시 읽어 CachedBody로 들고 있는다"""
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, path: str):
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        key = (st.st_mtime_ns, st.st_size)
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry and entry[0] == key:
+                return entry[1]
+        with open(path, "rb") as f:
+            cached = CachedBody(f.read())
+        with self._lock:
+            self._entries[path] = (key, cached)
+        return cached
+
+class EventBroadcaster:
+    """SSE 구독자에게 최신 이벤트 하나를 밀어준다
+
+    이벤트마다 번호(version)가 붙고, 구독자는 마지막으로 받은 번호보다 새 것만 받는다.
+    스트림 하나가 작업자 스레드 하나를 계속 잡고 있으므로 구독자 수는 max_clients로 제한한다.
+    """
+    def __init__(self, max_clients: int):
+        self.max_clients = max_clients
+        self.version = 0
+        self.event = None
+        self.clients = 0
+        self.closed = False
+        self._cond = threading.Condition()
+
+    def publish(self, name: str, data: bytes):
+        with self._cond:
+            self.version += 1
+            self.event = (self.version, name, data)
+            self._cond.notify_all()
+
+    def subscribe(self) -> bool:
+        with self._cond:
+            if self.closed or self.clients >= self.max_clients:
+                return False
+            self.clients += 1
+            return True
+
+    def unsubscribe(self):
+        with self._cond:
+            self.clients -= 1
+
+    def wait(self, seen: int, timeout: float):
+        """seen보다 새 이벤트가 오면 (version, name, data), timeout이 지나면 None"""
+        with self._cond:
+            self._cond.wait_for(lambda: self.closed or self.version > seen, timeout)
+            if self.version > seen and self.event is not None:
+                return self.event
+            return None
+
+    def close(self):
+        """서버 종료 시 기다리는 스트림을 모두 깨워서 끝낸다"""
+        with self._cond:
+            self.closed = True
+            self._cond.notify_all()
+
+class PooledHTTPServer(socketserver.TCPServer):
+    """요청(연결)을 스레드 풀에서 처리하는 HTTP 서버. 작업자 수가 정해져 있어 폭주해도 스레드가 늘지 않는다"""
+    # 윈도우의 SO_REUSEADDR은 사용 중인 포트에도 bind가 되어 8001... 포트 바꾸기가 동작하지 않는다
+    allow_reuse_address = os.name != "nt"
+    request_queue_size = REQUEST_QUEUE_SIZE
+
+    def __init__(self, server_address, handler_class, workers=SERVER_WORKERS):
+        # bind가 실패하면 TCPServer.__init__이 server_close()를 부르므로 풀을 먼저 만든다
+        self.workers = workers
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="http")
+        self._waiting = 0
+        self._lock = threading.Lock()
+        super().__init__(server_address, handler_class)
+
+    def saturated(self) -> bool:
+        """처리 못 하고 기다리는 연결이 있는지"""
+        return self._waiting > 0
+
+    def process_request(self, request, client_address):
+        with self._lock:
+            self._waiting += 1
+        self._pool.submit(self._process, request, client_address)
+
+    def _process(self, request, client_address):
+        with self._lock:
+            self._waiting -= 1
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+    def handle_error(self, request, client_address):
+        # 브라우저 탭을 닫는 등 클라이언트가 먼저 끊은 경우는 조용히 넘어간다
+        if isinstance(sys.exc_info()[1], ConnectionError):
+            return
+        super().handle_error(request, client_address)
+
+    def server_close(self):
+        super().server_close()
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+class PooledRequestHandler(http.server.SimpleHTTPRequestHandler):
+    """keep-alive를 지원하는 정적 파일 핸들러 (응답마다 Content-Length 필수)"""
+    protocol_version = "HTTP/1.1"
+    timeout = KEEPALIVE_TIMEOUT
+    static_cache = StaticFileCache()
+
+    def end_headers(self):
+        # 기다리는 연결이 있으면 이 연결은 응답 후 닫아서 작업자를 넘겨준다
+        if getattr(self.server, "saturated", None) and self.server.saturated():
+            self.send_header("Connection", "close")
+        super().end_headers()
+
+    def do_GET(self):
+        path = self.translate_path(self.path)
+        if path.endswith(CACHED_STATIC_EXT) and os.path.isfile(path):
+            cached = self.static_cache.get(path)
+            if cached is not None:
+                self.send_cached(cached, self.guess_type(path))
+                return
+        super().do_GET()
+
+    def send_cached(self, cached: CachedBody, content_type: str):
+        """ETag가 같으면 304, 클라이언트가 gzip을 받으면 압축본을 보낸다"""
+        etags = [t.strip() for t in self.headers.get("If-None-Match", "").split(",")]
+        if cached.etag in etags or "*" in etags:
+            self.send_response(304)
+            self.send_header('ETag', cached.etag)
+            self.send_header('Cache-Control', 'no-cache')
+            self.send_header('Access-Control-Allow-Origin', '*')
+            self.end_headers()
+            return
+
+        body = cached.body
+        accepts_gzip = "gzip" in self.headers.get("Accept-Encoding", "")
+        self.send_response(200)
+        self.send_header('Content-type', content_type)
+        if cached.gzipped is not None and accepts_gzip:
+            body = cached.gzipped
+            self.send_header('Content-Encoding', 'gzip')
+        self.send_header('Vary', 'Accept-Encoding')
+        self.send_header('ETag', cached.etag)
+        self.send_header('Cache-Control', 'no-cache')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_json(self, data, status: int = 200):
+        """dict를 JSON으로 (200이면 ETag/gzip 적용)"""
+        body = json.dumps(data, ensure_ascii=False).encode('utf-8')
+        if status == 200:
+            self.send_cached(CachedBody(body), 'application/json')
+        else:
+            self.send_bytes(body, 'application/json', status)
+
+    def send_bytes(self, body: bytes, content_type: str, status: int = 200):
+        self.send_response(status)
+        self.send_header('Content-type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_event_stream(self, broadcaster: EventBroadcaster):
+        """text/event-stream 응답. 구독자가 꽉 찼으면 503 (브라우저는 폴링으로 돌아간다)"""
+        if not broadcaster.subscribe():
+            self.send_bytes('{"error": "stream busy"}'.encode('utf-8'), 'application/json', 503)
+            return
+        try:
+            self.send_response(200)
+            self.send_header('Content-type', 'text/event-stream; charset=utf-8')
+            self.send_header('Cache-Control', 'no-cache')
+            self.send_header('Access-Control-Allow-Origin', '*')
+            self.send_header('Connection', 'close')    # 길이를 모르는 응답이라 끝나면 연결을 닫는다
+            self.end_headers()
+            self.wfile.write(f"retry: {STREAM_RETRY_MS}\n\n".encode('ascii'))
+            self.wfile.flush()
+
+            # 다시 붙은 브라우저는 Last-Event-ID 이후 놓친 이벤트를 바로 받는다
+            try:
+                seen = int(self.headers.get("Last-Event-ID", ""))
+            except ValueError:
+                seen = broadcaster.version
+            if seen > broadcaster.version:
+                # 서버가 다시 시작되어 번호가 처음부터인 경우: 지금 이벤트를 바로 보낸다
+                seen = 0
+            while not broadcaster.closed:
+                event = broadcaster.wait(seen, STREAM_HEARTBEAT_SEC)
+                if event is None:
+                    chunk = b": ping\n\n"
+                else:
+                    seen, name, data = event
+                    chunk = b"id: %d\nevent: %s\ndata: %s\n\n" % (seen, name.encode('ascii'), data)
+                self.wfile.write(chunk)
+                self.wfile.flush()
+        finally:
+            broadcaster.unsubscribe()
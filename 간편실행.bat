@@ -36,7 +36,7 @@ goto MENU
 cls
 echo 📊 빠른 순위 확인 중...
 echo.
-python show_ranks.py
+python naver_local_rank.py show
 echo.
 pause
 goto MENU
@@ -45,7 +45,7 @@ goto MENU
 cls
 echo 📋 상세 일일 리포트 생성 중...
 echo.
-python daily_summary.py
+python naver_local_rank.py summary
 echo.
 pause
 goto MENU
@@ -67,10 +67,10 @@ goto MENU
 cls
 echo 🔄 새로운 순위 데이터 수집 중... (약 2-3분 소요)
 echo.
-python main.py
+python naver_local_rank.py collect
 echo.
 echo 📊 Excel 리포트 생성 중...
-python make_report.py
+python naver_local_rank.py report
 echo.
 echo ✅ 데이터 수집 완료!
 pause
@@ -83,7 +83,7 @@ echo.
 echo 📍 다른 사람들이 접속할 수 있는 주소를 표시합니다
 echo 🚨 이 창을 닫으면 웹서버가 중단됩니다
 echo.
-python smart_web_server.py
+python naver_local_rank.py serve
 pause
 goto MENU
 